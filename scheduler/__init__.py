@@ -0,0 +1,8 @@
+"""
+Расписание автобусов и распределение водителей.
+
+Импорт пакета ничего не вычисляет и не выводит. pandas и tabulate нужны только
+для вывода таблиц (scheduler.render) и загружаются при первом обращении к ним.
+"""
+from .drivers import DRIVER_TYPES, Driver, assign_drivers_to_schedule
+from .timetable import bus_timetable, create_bus_schedule, create_weekly_bus_schedule, weekly_trips
@@ -0,0 +1,215 @@
+"""
+Замеры производительности жадного и генетического алгоритмов на синтетических сценариях.
+
+Пример запуска:
+    python -m scheduler.benchmark --quick --output report.json
+"""
+import argparse
+import gc
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from itertools import product
+
+from . import genetic
+from .drivers import assign_drivers_to_schedule
+from .render import format_table, weekly_bus_table, weekly_driver_table
+from .timetable import clear_cache, create_weekly_bus_schedule, departure_minutes, service_window, weekly_trips
+
+# Сетка сценариев по умолчанию
+LINES = [1, 10, 40]  # Количество маршрутов
+FLEET_SIZES = [4, 8, 16]  # Количество автобусов на маршруте
+HEADWAYS = [(10, 20), (5, 15)]  # Интервалы (час пик, остальное время)
+HORIZONS = [1, 7, 28]  # Горизонт планирования в днях
+
+# Уменьшенная сетка для быстрой проверки
+QUICK = {"lines": [1, 5], "fleet_sizes": [8], "headways": [(10, 20)], "horizons": [1, 7]}
+
+PEAK_HOURS_VARIANTS = [[(7, 9), (17, 19)], [(7, 10), (16, 19)], [(8, 9)]]
+
+
+def make_scenarios(lines=LINES, fleet_sizes=FLEET_SIZES, headways=HEADWAYS, horizons=HORIZONS, seed=0):
+    """
+    Строит сценарии: каждый маршрут получает свои время работы, время в пути и часы пик.
+    Параметры маршрутов зависят только от seed, поэтому отчеты разных коммитов сравнимы.
+    """
+    scenarios = []
+    for num_lines, num_buses, (peak, off_peak), horizon in product(lines, fleet_sizes, headways, horizons):
+        rng = random.Random(f"{seed}-{num_lines}-{num_buses}-{peak}-{off_peak}")
+        routes = []
+        for _ in range(num_lines):
+            routes.append({
+                "start_time": f"{rng.randint(5, 6):02d}:{rng.choice([0, 15, 30]):02d}",
+                "end_time": f"{rng.choice([23, 0, 1, 2, 3]):02d}:00",
+                "peak_intervals": peak,
+                "off_peak_intervals": off_peak,
+                "peak_hours": rng.choice(PEAK_HOURS_VARIANTS),
+                "num_buses": num_buses,
+                "road_time": rng.choice([30, 45, 60, 75, 90]),
+            })
+        scenarios.append({
+            "name": f"lines{num_lines}-buses{num_buses}-headway{peak}x{off_peak}-days{horizon}",
+            "horizon_days": horizon,
+            "routes": routes,
+        })
+    return scenarios
+
+
+def planned_departures(route, weekly_schedule):
+    """Количество запланированных отправлений на каждый день недели."""
+    start, end = service_window(route["start_time"], route["end_time"])
+    counts = {}
+    for day in weekly_schedule:
+        is_weekend = day in [5, 6]
+        counts[day] = len(departure_minutes(
+            start,
+            end,
+            route["off_peak_intervals"] if is_weekend else route["peak_intervals"],
+            route["off_peak_intervals"],
+            [] if is_weekend else route["peak_hours"],
+        ))
+    return counts
+
+
+def run_scenario(scenario, genetic_generations=0, workers=1):
+    """
+    Прогоняет сценарий и возвращает время этапов и показатели качества.
+
+    Водители распределяются на весь горизонт одним вызовом: дни нумеруются подряд,
+    день недели - day % 7, поэтому водители переходят из недели в неделю.
+    Кэш расписаний очищается, чтобы повторные прогоны замеряли построение расписаний, а не кэш.
+    """
+    clear_cache()
+    phases = {"timetable": 0.0, "assignment": 0.0, "render": 0.0}
+    if genetic_generations:
+        phases["genetic"] = 0.0
+    result = {"drivers_used": 0, "drivers_a": 0, "drivers_b": 0, "departures_planned": 0, "departures_dropped": 0}
+    if genetic_generations:
+        result["genetic_drivers_used"] = 0
+
+    horizon = scenario["horizon_days"]
+
+    for route in scenario["routes"]:
+        started = time.perf_counter()
+        weekly_schedule = create_weekly_bus_schedule(**route)
+        week = weekly_trips(weekly_schedule, route["road_time"])
+        days = [(day, week[day % 7][1]) for day in range(horizon)]
+        phases["timetable"] += time.perf_counter() - started
+
+        planned = planned_departures(route, weekly_schedule)
+        started = time.perf_counter()
+        drivers = assign_drivers_to_schedule(days)
+        phases["assignment"] += time.perf_counter() - started
+
+        result["drivers_used"] += len(drivers)
+        result["drivers_a"] += sum(driver.type == "A" for driver in drivers)
+        result["drivers_b"] += sum(driver.type == "B" for driver in drivers)
+        for day, trips in days:
+            result["departures_planned"] += planned[day % 7]
+            result["departures_dropped"] += planned[day % 7] - len(trips)
+
+        if genetic_generations:
+            started = time.perf_counter()
+            improved = genetic.optimize_drivers(drivers, generations=genetic_generations, workers=workers)
+            phases["genetic"] += time.perf_counter() - started
+            result["genetic_drivers_used"] += len(improved)
+
+        started = time.perf_counter()
+        format_table(weekly_bus_table(weekly_schedule, route["road_time"]), 'psql')
+        if horizon >= 7:
+            format_table(weekly_driver_table(drivers), "grid")
+        phases["render"] += time.perf_counter() - started
+
+    result["phases_s"] = {name: round(seconds, 6) for name, seconds in phases.items()}
+    result["total_s"] = round(sum(phases.values()), 6)
+    return result
+
+
+def measure_memory(scenario, genetic_generations=0, workers=1):
+    """
+    Пиковая память сценария (tracemalloc). Считается отдельным прогоном,
+    чтобы трассировка не искажала замеры времени.
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        run_scenario(scenario, genetic_generations, workers)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmark(scenarios, repeat=1, memory=True, genetic_generations=0, workers=1):
+    """
+    Прогоняет все сценарии и собирает отчет. Для времени берется лучший из repeat прогонов.
+    """
+    report = {
+        "version": 2,
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "genetic_generations": genetic_generations,
+        "scenarios": [],
+    }
+    for scenario in scenarios:
+        runs = [run_scenario(scenario, genetic_generations, workers) for _ in range(repeat)]
+        best = min(runs, key=lambda run: run["total_s"])
+        entry = {"name": scenario["name"], "lines": len(scenario["routes"]),
+                 "horizon_days": scenario["horizon_days"], **best}
+        if memory:
+            entry["peak_memory_bytes"] = measure_memory(scenario, genetic_generations, workers)
+        report["scenarios"].append(entry)
+        print(f"{entry['name']}: {entry['total_s']:.3f} с, водителей {entry['drivers_used']}, "
+              f"пропущено рейсов {entry['departures_dropped']}", file=sys.stderr)
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Замеры производительности планировщика расписания")
+    parser.add_argument("--quick", action="store_true", help="уменьшенная сетка сценариев")
+    parser.add_argument("--lines", type=int, nargs="+", help="количество маршрутов")
+    parser.add_argument("--buses", type=int, nargs="+", help="количество автобусов на маршруте")
+    parser.add_argument("--horizons", type=int, nargs="+", help="горизонт планирования в днях")
+    parser.add_argument("--repeat", type=int, default=1, help="количество прогонов каждого сценария")
+    parser.add_argument("--seed", type=int, default=0, help="зерно генерации сценариев")
+    parser.add_argument("--genetic-generations", type=int, default=0,
+                        help="поколений генетического алгоритма (0 - не запускать)")
+    parser.add_argument("--workers", type=int, default=1, help="процессов для генетического алгоритма")
+    parser.add_argument("--no-memory", action="store_true", help="не замерять пиковую память")
+    parser.add_argument("--output", help="файл для JSON-отчета (по умолчанию stdout)")
+    args = parser.parse_args(argv)
+
+    grid = dict(QUICK) if args.quick else {"lines": LINES, "fleet_sizes": FLEET_SIZES, "headways": HEADWAYS,
+                                           "horizons": HORIZONS}
+    if args.lines:
+        grid["lines"] = args.lines
+    if args.buses:
+        grid["fleet_sizes"] = args.buses
+    if args.horizons:
+        grid["horizons"] = args.horizons
+
+    report = run_benchmark(make_scenarios(seed=args.seed, **grid), repeat=args.repeat, memory=not args.no_memory,
+                           genetic_generations=args.genetic_generations, workers=args.workers)
+    text = json.dumps(report, indent=2, ensure_ascii=False, sort_keys=True)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Нижние оценки количества автобусов и водителей.
+
+Оценки показывают, насколько жадное распределение далеко от оптимума: если разрыв мал,
+запускать более тяжелую оптимизацию нет смысла.
+"""
+import heapq
+from math import ceil
+
+import numpy as np
+
+from .drivers import DRIVER_TYPES
+from .timetable import to_minutes
+
+MAX_SHIFT = max(driver_type["work_max"] for driver_type in DRIVER_TYPES.values())  # Самая длинная смена
+
+
+def trip_minutes(trips):
+    """
+    Переводит рейсы дня (отправление, прибытие, автобус) в массивы минут, отсортированные по отправлению.
+    """
+    departures = np.array([to_minutes(trip[0]) for trip in trips], dtype=np.int64)
+    arrivals = np.array([to_minutes(trip[1]) for trip in trips], dtype=np.int64)
+    order = np.argsort(departures, kind="stable")
+    return departures[order], arrivals[order]
+
+
+def max_overlap(departures, arrivals):
+    """
+    Наибольшее число одновременных рейсов (заметание по времени). Рейс, отправляющийся
+    в минуту прибытия другого, с ним пересекается, как в assign_buses и Driver.can_take_route.
+
+    :param departures: Отсортированный массив отправлений
+    :param arrivals: Массив прибытий в том же порядке
+    """
+    if not len(departures):
+        return 0
+    # Для каждого отправления: начавшиеся рейсы минус уже закончившиеся
+    finished = np.searchsorted(np.sort(arrivals), departures, side="left")
+    return int((np.arange(1, len(departures) + 1) - finished).max())
+
+
+def chain_cover(departures, arrivals, max_shift=MAX_SHIFT):
+    """
+    Нижняя оценка числа водителей на день: минимальное покрытие рейсов цепочками.
+
+    Рейс j может идти в смене сразу после рейса i, если он начинается после прибытия i
+    и смена от начала i до конца j не длиннее max_shift. Минимальное число цепочек равно
+    числу рейсов минус наибольшее паросочетание "предыдущий - следующий".
+    Условие "после прибытия" ослаблено до start_i < start_j - (самый короткий рейс),
+    тогда соседи каждого рейса образуют отрезок по времени отправления и наибольшее
+    паросочетание находится жадно (алгоритм Гловера) за O(n log n). Ослабление только
+    добавляет ребра, поэтому оценка остается нижней; при одинаковом времени в пути она точная.
+
+    :param departures: Отсортированный массив отправлений
+    :param arrivals: Массив прибытий в том же порядке
+    :param max_shift: Наибольшая длина смены (в минутах)
+    :return: Количество цепочек
+    """
+    count = len(departures)
+    if not count:
+        return 0
+    shortest = int((arrivals - departures).min())
+    # Предшественники рейса j: отправления в [lows[j], highs[j])
+    lows = (arrivals - max_shift).tolist()
+    highs = (departures - shortest).tolist()
+    order = sorted(range(count), key=lows.__getitem__)
+
+    matched = 0
+    waiting = []  # (правая граница, рейс), которым еще нужен предшественник
+    next_trip = 0
+    for departure in departures.tolist():
+        while next_trip < count and lows[order[next_trip]] <= departure:
+            trip = order[next_trip]
+            heapq.heappush(waiting, (highs[trip], trip))
+            next_trip += 1
+        while waiting and waiting[0][0] <= departure:
+            heapq.heappop(waiting)
+        if waiting:
+            heapq.heappop(waiting)
+            matched += 1
+    return count - matched
+
+
+def day_bounds(trips, max_shift=MAX_SHIFT):
+    """
+    Нижние оценки на один день.
+
+    :param trips: Рейсы дня (отправление, прибытие, автобус), как в weekly_trips
+    :return: Словарь: "trips" - число рейсов, "buses" - наибольшее число одновременных рейсов,
+             "drivers" - наибольшая из оценок: покрытие цепочками, одновременные рейсы
+             и суммарное время рейсов / max_shift
+    """
+    departures, arrivals = trip_minutes(trips)
+    overlap = max_overlap(departures, arrivals)
+    by_time = ceil(int((arrivals - departures).sum()) / max_shift)
+    return {
+        "trips": len(departures),
+        "buses": overlap,
+        "drivers": max(chain_cover(departures, arrivals, max_shift), overlap, by_time),
+    }
+
+
+def schedule_bounds(days, max_shift=MAX_SHIFT):
+    """
+    Нижние оценки на все дни расписания.
+
+    Водитель может работать в разные дни, поэтому оценка на неделю - не сумма по дням.
+    Но в два соседних дня, один из которых выходной, работают разные водители: тип A
+    не выходит в выходные, а тип B не работает два дня подряд. Для таких пар
+    оценки дней складываются.
+
+    :param days: Список пар (день, рейсы) из weekly_trips
+    :return: Словарь: "days" - оценки по дням, "buses" и "drivers" - оценки на весь период
+    """
+    per_day = {day: day_bounds(trips, max_shift) for day, trips in days}
+    drivers = max((bound["drivers"] for bound in per_day.values()), default=0)
+    for day, bound in per_day.items():
+        following = per_day.get(day + 1)
+        if following is not None and day % 7 >= 4:  # Пятница-суббота, суббота-воскресенье, воскресенье-понедельник
+            drivers = max(drivers, bound["drivers"] + following["drivers"])
+    buses = max((bound["buses"] for bound in per_day.values()), default=0)
+    return {"days": per_day, "buses": buses, "drivers": drivers}
+
+
+def optimality_gap(found, bound):
+    """Доля, на которую найденное значение больше нижней оценки (0 - оптимум доказан)."""
+    return (found - bound) / bound if bound else 0.0
+
+
+def format_bounds(bounds, drivers_used, buses_used):
+    """Строка с найденными значениями, нижними оценками и разрывом для вывода рядом с результатом."""
+    return (f"Водителей: {drivers_used}, нижняя оценка {bounds['drivers']} "
+            f"(разрыв {optimality_gap(drivers_used, bounds['drivers']):.0%}); "
+            f"автобусов: {buses_used}, нижняя оценка {bounds['buses']}")
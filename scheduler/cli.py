@@ -0,0 +1,237 @@
+"""
+Запуск планировщика из командной строки.
+
+Примеры:
+    python -m scheduler --num-buses 10 --road-time 45
+    python -m scheduler --config line.json --algorithm genetic --no-render
+    python -m scheduler --fleet --num-buses 6 --no-render
+    python -m scheduler --improve 2 --no-render
+    python -m scheduler --demand demand.csv --line 12 --capacity 90 --no-render
+"""
+import argparse
+import cProfile
+import json
+import pstats
+import sys
+
+from . import instrument
+from .bounds import format_bounds, schedule_bounds
+from .drivers import assign_drivers_to_schedule
+from .timetable import configure_cache, create_weekly_bus_schedule, weekly_trips
+
+# Параметры расписания по умолчанию
+DEFAULTS = {
+    "start_time": "06:00",  # Начало работы
+    "end_time": "03:00",  # Конец работы (следующего дня)
+    "peak_intervals": 10,  # Интервал в час пик (в минутах)
+    "off_peak_intervals": 20,  # Интервал вне часа пик (в минутах)
+    "peak_hours": [(7, 9), (17, 19)],  # Часы пик (7:00-9:00 и 17:00-19:00)
+    "num_buses": 8,  # Количество автобусов
+    "road_time": 60,  # Время в пути
+}
+
+
+def parse_peak_hours(values):
+    """
+    Разбирает часы пик из строк "7-9" или пар [7, 9].
+    """
+    peak_hours = []
+    for value in values:
+        if isinstance(value, str):
+            value = value.split("-")
+        start_hour, end_hour = value
+        peak_hours.append((int(start_hour), int(end_hour)))
+    return peak_hours
+
+
+def load_config(path):
+    """
+    Читает параметры расписания из JSON-файла с ключами как в DEFAULTS.
+    """
+    with open(path, encoding="utf-8") as file:
+        config = json.load(file)
+    unknown = set(config) - set(DEFAULTS)
+    if unknown:
+        raise ValueError(f"Неизвестные параметры в {path}: {', '.join(sorted(unknown))}")
+    if "peak_hours" in config:
+        config["peak_hours"] = parse_peak_hours(config["peak_hours"])
+    return config
+
+
+def run(params, algorithm="basic", render=True, generations=100, seed=0, workers=None, improve=0,
+        weekly_schedule=None):
+    """
+    Строит недельное расписание, распределяет водителей и выводит результат
+    вместе с нижними оценками числа водителей и автобусов.
+
+    :param params: Параметры расписания (ключи как в DEFAULTS)
+    :param algorithm: "basic" - жадное распределение, "genetic" - жадное с улучшением генетическим алгоритмом
+    :param render: Выводить таблицы (иначе только итоговая строка)
+    :param improve: Сколько секунд улучшать распределение локальным поиском (0 - не улучшать)
+    :param weekly_schedule: Готовое расписание по дням (например, по спросу из scheduler.demand);
+                            по умолчанию строится по интервалам и часам пик из params
+    :return: Список водителей
+    """
+    if weekly_schedule is None:
+        with instrument.phase("timetable"):
+            weekly_schedule = create_weekly_bus_schedule(**params)
+
+    if render:
+        from .render import format_table, weekly_bus_table
+
+        # Форматированный вывод расписания на неделю
+        with instrument.phase("render"):
+            print(format_table(weekly_bus_table(weekly_schedule, params["road_time"]), 'psql'))
+
+    # Распределяем водителей по расписанию
+    with instrument.phase("assignment"):
+        days = weekly_trips(weekly_schedule, params["road_time"])
+        drivers = assign_drivers_to_schedule(days)
+    if algorithm == "genetic":
+        from .genetic import optimize_drivers
+
+        with instrument.phase("genetic"):
+            drivers = optimize_drivers(drivers, generations=generations, seed=seed, workers=workers)
+    if improve > 0:
+        from .improve import improve_drivers
+
+        with instrument.phase("improve"):
+            drivers = improve_drivers(drivers, time_budget=improve)
+
+    if render:
+        from .render import format_table, print_drivers, weekly_driver_table
+
+        with instrument.phase("render"):
+            # Вывод результатов
+            print_drivers(drivers)
+
+            # Вывод таблицы
+            print(format_table(weekly_driver_table(drivers), "grid"))
+    else:
+        num_trips = sum(len(trips) for _, trips in days)
+        num_a = sum(driver.type == "A" for driver in drivers)
+        print(f"Рейсов: {num_trips}, водителей: {len(drivers)} (A: {num_a}, B: {len(drivers) - num_a})")
+
+    # Насколько результат далек от оптимума
+    with instrument.phase("bounds"):
+        buses_used = len({trip[2] for _, trips in days for trip in trips})
+        print(format_bounds(schedule_bounds(days), len(drivers), buses_used))
+
+    return drivers
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="scheduler", description="Расписание автобусов и распределение водителей")
+    parser.add_argument("--config", help="JSON-файл с параметрами расписания")
+    parser.add_argument("--start-time", help="начало работы (HH:MM)")
+    parser.add_argument("--end-time", help="конец работы (HH:MM)")
+    parser.add_argument("--peak-intervals", type=int, help="интервал в час пик (в минутах)")
+    parser.add_argument("--off-peak-intervals", type=int, help="интервал вне часа пик (в минутах)")
+    parser.add_argument("--peak-hours", nargs="*", help="часы пик, например 7-9 17-19")
+    parser.add_argument("--num-buses", type=int, help="количество автобусов")
+    parser.add_argument("--road-time", type=int, help="время в пути (в минутах)")
+    parser.add_argument("--demand", help="CSV со спросом (line, day, time, passengers): интервалы по спросу")
+    parser.add_argument("--line", help="маршрут из файла спроса (по умолчанию первый)")
+    parser.add_argument("--capacity", type=int, default=80, help="вместимость автобуса для расчета по спросу")
+    parser.add_argument("--load-factor", type=float, default=0.8, help="целевая наполняемость для расчета по спросу")
+    parser.add_argument("--algorithm", choices=["basic", "genetic"], default="basic",
+                        help="алгоритм распределения водителей")
+    parser.add_argument("--generations", type=int, default=100, help="поколений генетического алгоритма")
+    parser.add_argument("--seed", type=int, default=0, help="зерно генетического алгоритма")
+    parser.add_argument("--workers", type=int, help="процессов для генетического алгоритма")
+    parser.add_argument("--improve", type=float, default=0, metavar="SECONDS",
+                        help="улучшать распределение локальным поиском не дольше SECONDS секунд")
+    parser.add_argument("--no-render", action="store_true", help="не выводить таблицы")
+    parser.add_argument("--fleet", action="store_true",
+                        help="рассчитать нужное количество автобусов вместо распределения водителей")
+    parser.add_argument("--export", help="файл для расписания в двоичном формате (scheduler.storage)")
+    parser.add_argument("--validate", action="store_true",
+                        help="проверить распределение по правилам; код возврата 1 при нарушении жестких правил")
+    parser.add_argument("--metrics", help="файл для JSON с временем этапов и счетчиками")
+    parser.add_argument("--count-rules", action="store_true",
+                        help="считать проверки правил водителей по причинам отказа (медленнее)")
+    parser.add_argument("--profile",
+                        choices=["timetable", "assignment", "genetic", "improve", "render", "bounds", "validate"],
+                        help="профилировать этап (cProfile, отчет в stderr)")
+    parser.add_argument("--cache-dir", help="каталог для хранения рассчитанных расписаний между запусками")
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.cache_dir:
+        configure_cache(directory=args.cache_dir)
+
+    # Параметры по умолчанию < файл конфигурации < аргументы командной строки
+    params = dict(DEFAULTS)
+    if args.config:
+        params.update(load_config(args.config))
+    for name in DEFAULTS:
+        value = getattr(args, name)
+        if value is not None:
+            params[name] = parse_peak_hours(value) if name == "peak_hours" else value
+
+    weekly_schedule = None
+    if args.demand:
+        from .demand import create_demand_schedule, demand_fleet, load_demand
+
+        try:
+            names, demand = load_demand(args.demand, params["start_time"], params["end_time"])
+        except ValueError as error:
+            parser.error(str(error))
+        if not names:
+            parser.error(f"{args.demand}: нет данных о спросе")
+        if args.line is not None and args.line not in names:
+            parser.error(f"маршрута {args.line} нет в {args.demand}, есть: {', '.join(names)}")
+        line_demand = demand[names.index(args.line) if args.line is not None else 0]
+        demand_params = (line_demand, params["start_time"], params["end_time"], params["num_buses"],
+                         params["road_time"])
+        if args.fleet:
+            from .fleet import print_fleet
+
+            report = demand_fleet(*demand_params, capacity=args.capacity, load_factor=args.load_factor)
+            print_fleet(report, blocks=not args.no_render)
+            return
+        weekly_schedule = create_demand_schedule(*demand_params, capacity=args.capacity, load_factor=args.load_factor)
+
+    if args.fleet:
+        from .fleet import print_fleet, weekly_fleet
+
+        print_fleet(weekly_fleet(**params), blocks=not args.no_render)
+        return
+
+    metrics = None
+    if args.metrics or args.count_rules or args.profile:
+        metrics = instrument.enable(count_rules=args.count_rules,
+                                    profilers={args.profile: cProfile.Profile} if args.profile else None)
+
+    try:
+        drivers = run(params, algorithm=args.algorithm, render=not args.no_render, generations=args.generations,
+                      seed=args.seed, workers=args.workers, improve=args.improve, weekly_schedule=weekly_schedule)
+        if args.export:
+            from .storage import write_schedule
+
+            write_schedule(args.export, [drivers])
+        violations = None
+        if args.validate:
+            from .validate import HARD_RULES, validate
+
+            with instrument.phase("validate"):
+                counts, _ = validate(drivers)
+            print("Нарушения: " + ", ".join(f"{rule}: {count}" for rule, count in counts.items()))
+            violations = sum(counts[rule] for rule in HARD_RULES)
+    finally:
+        instrument.disable()
+
+    if metrics is not None:
+        if args.profile in metrics.profiles:
+            pstats.Stats(metrics.profiles[args.profile], stream=sys.stderr).sort_stats("cumulative").print_stats(20)
+        if args.metrics:
+            with open(args.metrics, "w", encoding="utf-8") as file:
+                file.write(metrics.to_json() + "\n")
+        else:
+            print(metrics.to_json(), file=sys.stderr)
+
+    if violations:
+        sys.exit(1)
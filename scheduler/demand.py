@@ -0,0 +1,167 @@
+"""
+Отправления по спросу: интервалы движения считаются из числа пассажиров по слотам времени
+вместо двух постоянных интервалов и часов пик.
+
+Спрос - массив пассажиров за слот (по умолчанию 15 минут) с любым количеством ведущих измерений,
+например (маршруты, дни, слоты). Слот 0 начинается в начале работы. Нужная частота в слоте -
+спрос, деленный на вместимость автобуса с учетом целевой наполняемости, ограниченная интервалами
+min_headway и max_headway. Отправления ставятся там, где накопленная частота проходит целые значения,
+поэтому все ряды считаются через np.repeat без циклов по маршрутам и дням.
+"""
+import csv
+
+import numpy as np
+
+from .fleet import departures_fleet
+from .timetable import assign_buses, create_bus_schedule, parse_minutes, service_window
+
+SLOT_MINUTES = 15
+CAPACITY = 80  # Вместимость автобуса (пассажиров)
+LOAD_FACTOR = 0.8  # Целевая наполняемость
+MIN_HEADWAY = 3  # Наименьший интервал (в минутах)
+MAX_HEADWAY = 30  # Наибольший интервал (в минутах): минимальное обслуживание без спроса
+
+
+def slot_rates(demand, capacity=CAPACITY, load_factor=LOAD_FACTOR, slot_minutes=SLOT_MINUTES,
+               min_headway=MIN_HEADWAY, max_headway=MAX_HEADWAY):
+    """
+    Нужное количество отправлений в каждом слоте (дробное).
+
+    :param demand: Пассажиры за слот, массив любой формы (последнее измерение - слоты)
+    :return: Массив той же формы
+    """
+    if capacity <= 0 or not 0 < load_factor <= 1:
+        raise ValueError("Вместимость должна быть положительной, наполняемость - от 0 до 1")
+    if not 1 <= min_headway <= max_headway:
+        raise ValueError("Интервалы должны удовлетворять 1 <= min_headway <= max_headway")
+    rates = np.asarray(demand, dtype=np.float64) / (capacity * load_factor)
+    return np.clip(rates, slot_minutes / max_headway, slot_minutes / min_headway)
+
+
+def headways(demand, capacity=CAPACITY, load_factor=LOAD_FACTOR, slot_minutes=SLOT_MINUTES,
+             min_headway=MIN_HEADWAY, max_headway=MAX_HEADWAY):
+    """
+    Интервал движения в каждом слоте (в минутах), массив той же формы, что demand.
+    """
+    return slot_minutes / slot_rates(demand, capacity, load_factor, slot_minutes, min_headway, max_headway)
+
+
+def demand_departures(demand, start, end, capacity=CAPACITY, load_factor=LOAD_FACTOR, slot_minutes=SLOT_MINUTES,
+                      min_headway=MIN_HEADWAY, max_headway=MAX_HEADWAY):
+    """
+    Отправления для всех рядов спроса сразу.
+
+    :param demand: Пассажиры за слот, форма (..., слоты); ведущие измерения - ряды (например, маршруты и дни)
+    :param start: Начало работы (в минутах от полуночи), начало слота 0
+    :param end: Окончание работы (в минутах, может быть больше суток); отправления строго раньше end
+    :return: Пара: отправления всех рядов подряд (int64, в минутах от полуночи) и границы рядов
+             (offsets[i]:offsets[i + 1] - отправления ряда i в порядке ведущих измерений)
+    """
+    rates = slot_rates(demand, capacity, load_factor, slot_minutes, min_headway, max_headway)
+    slots = rates.shape[-1]
+    rates = rates.reshape(-1, slots)
+    rows = len(rates)
+
+    # Накопленная частота к концу и к началу каждого слота; отправление k - там, где она равна k
+    cumulative = np.cumsum(rates, axis=1)
+    before = np.zeros_like(cumulative)
+    before[:, 1:] = cumulative[:, :-1]
+
+    # Внутри слота частота постоянна: в слоте отправления с номерами k от ceil(before) до ceil(after) - 1,
+    # отправление k - через (k - before) * step минут от начала слота
+    step = slot_minutes / rates
+    first = start + np.arange(slots) * slot_minutes + (np.ceil(before) - before) * step  # Первое отправление слота
+    # Только отправления раньше end (поправка 1e-6 - та же, что при переводе в целые минуты ниже)
+    per_slot = np.ceil(cumulative) - np.ceil(before)
+    np.minimum(per_slot, np.maximum(np.ceil((end - 1e-6 - first) / step), 0), out=per_slot)
+    row_counts = per_slot.sum(axis=1).astype(np.int64)
+    per_slot = per_slot.astype(np.int64).ravel()
+
+    # Отправление j (номер среди всех) в слоте s: first[s] + (j - номер первого отправления слота s) * step[s]
+    step = step.ravel()
+    offsets = np.cumsum(per_slot) - per_slot
+    departures = np.arange(row_counts.sum(), dtype=np.float64)
+    departures *= np.repeat(step, per_slot)
+    departures += np.repeat(first.ravel() - offsets * step, per_slot)
+    departures += 1e-6  # Иначе отправление ровно на границе минуты из-за ошибки округления уходит на минуту раньше
+    return departures.astype(np.int64), np.concatenate(([0], np.cumsum(row_counts)))
+
+
+def day_departures(demand, start_time, end_time, **options):
+    """
+    Отправления одного дня для create_bus_schedule(..., departures=...).
+
+    :param demand: Пассажиры за слот (одномерный массив)
+    :param options: capacity, load_factor, slot_minutes, min_headway, max_headway (см. slot_rates)
+    :return: Массив отправлений (в минутах от полуночи)
+    """
+    start, end = service_window(start_time, end_time)
+    departures, _ = demand_departures(np.asarray(demand)[None, :], start, end, **options)
+    return departures
+
+
+def load_demand(path, start_time, end_time, slot_minutes=SLOT_MINUTES):
+    """
+    Читает спрос из CSV со столбцами line, day, time, passengers (время "HH:MM" - начало слота,
+    время после полуночи относится к тому же дню обслуживания). Пассажиры одного слота суммируются.
+
+    :return: Пара: названия маршрутов в порядке появления и массив спроса (маршруты, дни, слоты)
+    """
+    start, end = service_window(start_time, end_time)
+    slots = -(-(end - start) // slot_minutes)
+
+    names = {}
+    lines, days, minutes, passengers = [], [], [], []
+    with open(path, newline="", encoding="utf-8") as file:
+        for row in csv.DictReader(file):
+            lines.append(names.setdefault(row["line"], len(names)))
+            days.append(int(row["day"]))
+            minutes.append(parse_minutes(row["time"]))
+            passengers.append(float(row["passengers"]))
+
+    minutes = np.array(minutes, dtype=np.int64)
+    minutes = np.where(minutes < start, minutes + 24 * 60, minutes)
+    slot = (minutes - start) // slot_minutes
+    if len(slot) and (slot >= slots).any():
+        raise ValueError(f"{path}: спрос вне времени работы {start_time}-{end_time}")
+    days = np.array(days, dtype=np.int64)
+
+    demand = np.zeros((len(names), int(days.max()) + 1 if len(days) else 0, slots))
+    np.add.at(demand, (np.array(lines, dtype=np.int64), days, slot), passengers)
+    return list(names), demand
+
+
+def create_demand_schedule(demand, start_time, end_time, num_buses, road_time, **options):
+    """
+    Создает расписание автобусов маршрута по спросу на каждый день.
+
+    :param demand: Пассажиры за слот, форма (дни, слоты); день 0 - понедельник
+    :param options: capacity, load_factor, slot_minutes, min_headway, max_headway (см. slot_rates)
+    :return: Словарь с расписанием для каждого дня, как create_weekly_bus_schedule
+    """
+    start, end = service_window(start_time, end_time)
+    departures, offsets = demand_departures(demand, start, end, **options)
+    return {
+        day: create_bus_schedule(start_time, end_time, None, None, None, num_buses, road_time,
+                                 departures=departures[offsets[day]:offsets[day + 1]])
+        for day in range(len(offsets) - 1)
+    }
+
+
+def demand_fleet(demand, start_time, end_time, num_buses, road_time, **options):
+    """
+    Размер парка по спросу на каждый день (отчет как у scheduler.fleet.weekly_fleet).
+
+    :param demand: Пассажиры за слот, форма (дни, слоты)
+    """
+    start, end = service_window(start_time, end_time)
+    departures, offsets = demand_departures(demand, start, end, **options)
+    days = {}
+    for day in range(len(offsets) - 1):
+        current = departures[offsets[day]:offsets[day + 1]]
+        days[day] = departures_fleet(current, assign_buses(current, num_buses, road_time), num_buses, road_time)
+    return {
+        "days": days,
+        "min_fleet": max((result["min_fleet"] for result in days.values()), default=0),
+        "dropped": sum(result["dropped"] for result in days.values()),
+    }
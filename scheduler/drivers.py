@@ -0,0 +1,470 @@
+import heapq
+from array import array
+from bisect import bisect_left
+from collections.abc import Sequence
+
+from . import instrument
+from .timetable import from_minutes, to_minutes
+
+# Константы
+DRIVER_TYPES = {
+    "A": {"work_min": 8 * 60, "work_max": 9 * 60, "break_duration": 60},  # Тип A: 8-9 часов работы, 1 час перерыв
+    "B": {"work_min": 11 * 60, "work_max": 12 * 60, "break_duration": 0},  # Тип B: 11-12 часов работы, без перерыва
+}
+
+
+DAILY_SLOTS = 7  # Сколько последних рабочих дней хранит водитель для подсчета дневной нормы
+
+
+class RoutesView(Sequence):
+    """
+    Маршруты водителя в прежнем виде: кортежи (день, автобус, начало, конец) с объектами времени.
+    Кортежи собираются из столбцов водителя при обращении и не хранятся.
+    """
+
+    __slots__ = ("_driver",)
+
+    def __init__(self, driver):
+        self._driver = driver
+
+    def __len__(self):
+        return len(self._driver.route_days)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        driver = self._driver
+        return (driver.route_days[index], driver.route_buses[index],
+                from_minutes(driver.route_starts[index]), from_minutes(driver.route_ends[index]))
+
+    def __eq__(self, other):
+        return isinstance(other, Sequence) and list(self) == list(other)
+
+    def __repr__(self):
+        return repr(list(self))
+
+
+class Driver:
+    """
+    Водитель с маршрутами в столбцах: день, автобус, начало и конец в минутах от полуночи
+    первого дня (array). Отработанные минуты по дням хранятся в массиве фиксированного
+    размера DAILY_SLOTS, где ячейка дня - day % DAILY_SLOTS.
+    """
+
+    __slots__ = ("id", "type", "work_min", "work_max", "break_duration", "total_minutes_worked",
+                 "route_days", "route_buses", "route_starts", "route_ends", "_daily", "_daily_days")
+
+    def __init__(self, driver_id, driver_type):
+        self.id = driver_id
+        self.type = driver_type
+        self.work_min = DRIVER_TYPES[driver_type]["work_min"]
+        self.work_max = DRIVER_TYPES[driver_type]["work_max"]
+        self.break_duration = DRIVER_TYPES[driver_type]["break_duration"]
+        self.total_minutes_worked = 0
+        self._clear()
+
+    def _clear(self):
+        self.route_days = array('i')
+        self.route_buses = array('i')
+        self.route_starts = array('q')
+        self.route_ends = array('q')
+        self._daily = array('d', bytes(8 * DAILY_SLOTS))  # Сколько минут отработано в каждый день
+        self._daily_days = array('i', [-1] * DAILY_SLOTS)
+
+    @property
+    def routes(self):
+        """Список маршрутов (день, автобус, начало, конец)."""
+        return RoutesView(self)
+
+    @property
+    def daily_minutes_worked(self):
+        """Отработанные минуты по дням (последние DAILY_SLOTS рабочих дней)."""
+        return {day: minutes for day, minutes in zip(self._daily_days, self._daily) if day >= 0}
+
+    def daily_minutes(self, day):
+        slot = day % DAILY_SLOTS
+        return self._daily[slot] if self._daily_days[slot] == day else 0
+
+    def can_take_route(self, day, start_time, end_time):
+        """
+        Проверяет, может ли водитель взять маршрут.
+        """
+        reason = self.rejection_reason(day, start_time, end_time)
+        if instrument.counting_rules():
+            instrument.count_rule(reason)
+        return reason is None
+
+    def rejection_reason(self, day, start_time, end_time):
+        """
+        Причина, по которой водитель не может взять маршрут (одна из instrument.REASONS), или None.
+        """
+        start = to_minutes(start_time)
+        end = to_minutes(end_time)
+        route_minutes = end - start
+        start_hour = start // 60 % 24
+        end_hour = end // 60 % 24
+
+        daily_worked = self.daily_minutes(day)
+        if self.type == 'A' and (((6 > start_hour or 8 <= start_hour) and daily_worked == 0) or end_hour > 18
+                                 or end_hour < 1):
+            return "type_a_window"
+
+        if self.type == 'B' and self.route_days and self.route_days[-1] != day and self.route_days[-1] + 2 > day:
+            return "type_b_rest"
+
+        # Проверяем дневную норму работы
+        if daily_worked + route_minutes > self.work_max:
+            return "daily_max"
+
+        # Проверяем пересечение с уже назначенными маршрутами
+        for assigned_day, assigned_start, assigned_end in zip(self.route_days, self.route_starts, self.route_ends):
+            if assigned_day == day and not (end < assigned_start or start > assigned_end):
+                return "overlap"
+
+        return None
+
+    def assign_route(self, day, bus_id, start_time, end_time):
+        """
+        Назначает маршрут водителю.
+        """
+        self._append(day, bus_id, to_minutes(start_time), to_minutes(end_time))
+
+    def _append(self, day, bus_id, start, end):
+        # Минуты считаются от конца предыдущего маршрута того же дня
+        last_tr = self.route_ends[-1] if self.route_days and self.route_days[-1] == day else start
+
+        self.route_days.append(day)
+        self.route_buses.append(bus_id)
+        self.route_starts.append(start)
+        self.route_ends.append(end)
+
+        slot = day % DAILY_SLOTS
+        if self._daily_days[slot] != day:
+            self._daily_days[slot] = day
+            self._daily[slot] = 0
+        self._daily[slot] += end - last_tr
+        self.total_minutes_worked += float(end - last_tr)
+
+    def can_insert_route(self, day, start_time, end_time):
+        """
+        Проверяет, может ли водитель взять маршрут в любом месте своего расписания,
+        а не только после последнего маршрута. Дневная норма проверяется по длине смены
+        после вставки, правило типа B - по соседним дням с обеих сторон.
+        """
+        start = to_minutes(start_time)
+        end = to_minutes(end_time)
+        first_start = start
+        last_end = end
+        for assigned_day, assigned_start, assigned_end in zip(self.route_days, self.route_starts, self.route_ends):
+            if assigned_day == day:
+                if not (end < assigned_start or start > assigned_end):
+                    return False
+                first_start = min(first_start, assigned_start)
+                last_end = max(last_end, assigned_end)
+            elif self.type == 'B' and abs(assigned_day - day) < 2:
+                return False
+
+        if last_end - first_start > self.work_max:
+            return False
+
+        if self.type == 'A' and (not 6 <= first_start // 60 % 24 < 8 or end // 60 % 24 > 18 or end // 60 % 24 < 1):
+            return False
+
+        return True
+
+    def insert_route(self, day, bus_id, start_time, end_time):
+        """
+        Добавляет маршрут в любое место расписания и пересчитывает отработанные минуты.
+        """
+        self._replay(list(self._columns()) + [(day, bus_id, to_minutes(start_time), to_minutes(end_time))])
+
+    def remove_routes(self, predicate):
+        """
+        Удаляет маршруты, для которых predicate(маршрут) истинно, и пересчитывает отработанные минуты.
+
+        :return: Список удаленных маршрутов
+        """
+        kept = []
+        removed = []
+        for route, columns in zip(self.routes, self._columns()):
+            if predicate(route):
+                removed.append(route)
+            else:
+                kept.append(columns)
+        if removed:
+            self._replay(kept)
+        return removed
+
+    def forget_before(self, day):
+        """
+        Удаляет маршруты дней раньше day. Отработанные минуты за оставшиеся дни и за все время не меняются.
+        """
+        keep_from = bisect_left(self.route_days, day)
+        if keep_from:
+            del self.route_days[:keep_from]
+            del self.route_buses[:keep_from]
+            del self.route_starts[:keep_from]
+            del self.route_ends[:keep_from]
+
+    def _columns(self):
+        return zip(self.route_days, self.route_buses, self.route_starts, self.route_ends)
+
+    def _replay(self, routes):
+        """Пересчитывает минуты, заново назначая маршруты по порядку дней и времени."""
+        self._clear()
+        self.total_minutes_worked = 0
+        for route in sorted(routes, key=lambda route: (route[0], route[2])):
+            self._append(*route)
+
+
+def shift_fits(driver_type, day, trips, days):
+    """
+    Проверяет смену водителя на день по тем же правилам, что Driver.can_insert_route.
+
+    :param trips: Рейсы смены (начало, конец, автобус), отсортированные по началу
+    :param days: Рабочие дни водителя (смена этого дня не учитывается)
+    """
+    if not trips:
+        return True
+    if trips[-1][1] - trips[0][0] > DRIVER_TYPES[driver_type]["work_max"]:
+        return False
+    for previous, trip in zip(trips, trips[1:]):
+        if trip[0] <= previous[1]:
+            return False
+    if driver_type == 'A':
+        if day % 7 >= 5 or not 6 <= trips[0][0] // 60 % 24 < 8:
+            return False
+        for _, end, _ in trips:
+            if not 1 <= end // 60 % 24 <= 18:
+                return False
+    elif (day - 1 in days or day + 1 in days) and day not in days:
+        return False
+    return True
+
+
+class _MinTree:
+    """
+    Дерево минимумов по номерам водителей.
+    Позволяет за O(log n) найти водителя с наименьшим номером, у которого значение не больше порога.
+    """
+
+    def __init__(self, capacity=64):
+        self.size = 1
+        while self.size < capacity:
+            self.size *= 2
+        self.values = [float('inf')] * (2 * self.size)
+
+    def set(self, index, value):
+        if index >= self.size:
+            self._grow(index + 1)
+        index += self.size
+        self.values[index] = value
+        index //= 2
+        while index:
+            self.values[index] = min(self.values[2 * index], self.values[2 * index + 1])
+            index //= 2
+
+    def leftmost(self, limit):
+        """Возвращает наименьший номер со значением <= limit или -1."""
+        if self.values[1] > limit:
+            return -1
+        index = 1
+        while index < self.size:
+            index = 2 * index if self.values[2 * index] <= limit else 2 * index + 1
+        return index - self.size
+
+    def clear(self):
+        self.values = [float('inf')] * (2 * self.size)
+
+    def _grow(self, capacity):
+        leaves = self.values[self.size:]
+        self.__init__(max(capacity, 2 * self.size))
+        for index, value in enumerate(leaves):
+            if value != float('inf'):
+                self.set(index, value)
+
+
+class _IndexedPool:
+    """
+    Индекс доступности водителей одного типа.
+
+    Водители, уже работающие сегодня, лежат либо в куче занятых (по времени окончания
+    последнего рейса), либо в дереве свободных (значение - отработанные за день минуты).
+    Водители, еще не работавшие сегодня, взаимозаменяемы, поэтому из них берется
+    водитель с наименьшим номером. Результат совпадает с перебором списка по порядку,
+    если рейсы внутри дня идут по возрастанию времени отправления.
+    """
+
+    def __init__(self, driver_type):
+        self.type = driver_type
+        self.work_max = DRIVER_TYPES[driver_type]["work_max"]
+        self.drivers = []
+        self.ready = _MinTree()
+        self.busy = []  # (окончание последнего рейса, номер водителя)
+        self.idle = []  # номера водителей, которые могут начать день
+
+    def start_day(self, day):
+        self.ready.clear()
+        self.busy = []
+        # Тип B может выйти, только если отдыхал после последнего рабочего дня
+        self.idle = [i for i, driver in enumerate(self.drivers)
+                     if self.type != 'B' or not driver.route_days or driver.route_days[-1] + 2 <= day]
+
+    def find(self, day, start_time, end_time):
+        while self.busy and self.busy[0][0] < start_time:
+            _, index = heapq.heappop(self.busy)
+            self.ready.set(index, self.drivers[index].daily_minutes(day))
+
+        route_minutes = (end_time - start_time).total_seconds() / 60
+        if self.type == 'A' and (end_time.hour > 18 or end_time.hour < 1):
+            return None
+
+        candidate = self.ready.leftmost(self.work_max - route_minutes)
+        idle_allowed = route_minutes <= self.work_max and (self.type != 'A' or 6 <= start_time.hour < 8)
+        if self.idle and idle_allowed and (candidate < 0 or self.idle[0] < candidate):
+            candidate = heapq.heappop(self.idle)
+        elif candidate >= 0:
+            self.ready.set(candidate, float('inf'))
+        else:
+            return None
+
+        heapq.heappush(self.busy, (end_time, candidate))
+        return self.drivers[candidate]
+
+    def add(self, driver, end_time):
+        heapq.heappush(self.busy, (end_time, len(self.drivers)))
+        self.drivers.append(driver)
+
+
+class _LinearPool:
+    """
+    Перебор водителей по порядку. Используется, если рейсы не упорядочены по времени.
+    """
+
+    def __init__(self, driver_type):
+        self.drivers = []
+
+    def start_day(self, day):
+        pass
+
+    def find(self, day, start_time, end_time):
+        for driver in self.drivers:
+            if driver.can_take_route(day, start_time, end_time):
+                return driver
+        return None
+
+    def add(self, driver, end_time):
+        self.drivers.append(driver)
+
+
+def _is_chronological(bus_schedule):
+    """
+    Проверяет, что дни идут по возрастанию, а рейсы внутри дня - по времени отправления.
+    """
+    last_day = None
+    for day, routes in bus_schedule:
+        if last_day is not None and day <= last_day:
+            return False
+        last_day = day
+        previous = None
+        for route in routes:
+            if route[1] <= route[0] or (previous is not None and route[0] < previous):
+                return False
+            previous = route[0]
+    return True
+
+
+class DriverAssigner:
+    """
+    Жадное распределение водителей, которое можно продолжать день за днем.
+    Состояние водителей (последний рабочий день, отработанные минуты) сохраняется
+    между вызовами assign_day, поэтому горизонт планирования не ограничен неделей.
+    День недели определяется как day % 7.
+    """
+
+    def __init__(self, indexed=True):
+        pool_class = _IndexedPool if indexed else _LinearPool
+        self.drivers_a = pool_class("A")  # Водители типа A
+        self.drivers_b = pool_class("B")  # Водители типа B
+        self.next_driver_a_id = 1
+        self.next_driver_b_id = 1
+
+    @property
+    def drivers(self):
+        return self.drivers_a.drivers + self.drivers_b.drivers
+
+    def assign_day(self, day, routes):
+        """
+        Назначает водителей на рейсы одного дня (отправление, прибытие, автобус).
+        Дни должны идти по возрастанию.
+
+        :return: Список водителей в порядке рейсов
+        """
+        drivers_a = self.drivers_a
+        drivers_b = self.drivers_b
+        drivers_a.start_day(day)
+        drivers_b.start_day(day)
+        assigned = []
+        for route in routes:
+            start_time = route[0]
+            end_time = route[1]
+            bus_id = route[2]
+
+            # Назначаем водителя типа A (понедельник-пятница)
+            if day % 7 in range(0, 5):  # Понедельник (0) -> Пятница (4)
+                driver = drivers_a.find(day, start_time, end_time)
+
+                if driver is None:
+                    new_driver = Driver(self.next_driver_a_id, "A")
+
+                    if new_driver.can_take_route(day, start_time, end_time):
+                        driver = new_driver
+                        self.next_driver_a_id += 1
+                        drivers_a.add(new_driver, end_time)
+                        instrument.count("new_drivers.A")
+
+                if driver is None:
+                    driver = drivers_b.find(day, start_time, end_time)
+
+                    if driver is None:
+                        driver = Driver(self.next_driver_b_id, "B")
+                        self.next_driver_b_id += 1
+                        drivers_b.add(driver, end_time)
+                        instrument.count("new_drivers.B")
+                    instrument.count("fallback.weekday_to_b")
+
+            # Назначаем водителя типа B (раз в три дня)
+            else:  # Суббота (5) -> Воскресенье (6)
+                driver = drivers_b.find(day, start_time, end_time)
+
+                if driver is None:
+                    driver = Driver(self.next_driver_b_id, "B")
+                    self.next_driver_b_id += 1
+                    drivers_b.add(driver, end_time)
+                    instrument.count("new_drivers.B")
+
+            driver.assign_route(day, bus_id, start_time, end_time)
+            assigned.append(driver)
+
+        return assigned
+
+    def forget_before(self, day):
+        """Удаляет у водителей маршруты дней раньше day, чтобы история не росла."""
+        for driver in self.drivers_a.drivers:
+            driver.forget_before(day)
+        for driver in self.drivers_b.drivers:
+            driver.forget_before(day)
+
+
+def assign_drivers_to_schedule(bus_schedule):
+    """
+    Распределяет водителей по рейсам.
+
+    :param bus_schedule: Список пар (день, рейсы), рейс - (отправление, прибытие, автобус)
+    :return: Список водителей: сначала типа A, затем типа B
+    """
+    # Счетчики проверок правил требуют проверять водителей по одному
+    assigner = DriverAssigner(_is_chronological(bus_schedule) and not instrument.counting_rules())
+    for day, routes in bus_schedule:
+        assigner.assign_day(day, routes)
+    return assigner.drivers
@@ -0,0 +1,70 @@
+"""
+Расчет размера парка: сколько автобусов нужно, чтобы выполнить все запланированные отправления,
+и сколько отправлений пропадет при заданном количестве автобусов.
+"""
+from .timetable import assign_buses, day_timetable, group_by_bus
+
+
+def day_fleet(day, start_time, end_time, peak_intervals, off_peak_intervals, peak_hours, num_buses, road_time):
+    """
+    Размер парка на один день.
+
+    :param day: Номер дня от понедельника (в выходные часов пик нет)
+    :return: Словарь: "planned" - запланировано отправлений, "min_fleet" - нужно автобусов,
+             "blocks" - для каждого автобуса минимального парка его отправления (в минутах),
+             "num_buses" - заданное количество автобусов, "dropped" - сколько отправлений при нем пропадет
+    """
+    # В расписании дня есть все запланированные отправления, у пропущенных автобус -1
+    departures, buses = day_timetable(day, start_time, end_time, peak_intervals, off_peak_intervals, peak_hours,
+                                      num_buses, road_time)
+    return departures_fleet(departures, buses, num_buses, road_time)
+
+
+def departures_fleet(departures, buses, num_buses, road_time):
+    """
+    Размер парка для готовых отправлений дня (см. day_fleet).
+
+    :param departures: Отсортированный массив отправлений (в минутах)
+    :param buses: Номера автобусов при num_buses автобусах (assign_buses), -1 - отправление пропущено
+    """
+    # Автобусов столько же, сколько отправлений: каждое получает освободившийся автобус с наименьшим номером,
+    # а новый - только если свободных нет, поэтому автобусов используется столько, сколько рейсов идет одновременно
+    blocks = assign_buses(departures, len(departures), road_time)
+    min_fleet = int(blocks.max()) + 1 if len(blocks) else 0
+
+    return {
+        "planned": len(departures),
+        "min_fleet": min_fleet,
+        "blocks": [block.tolist() for block in group_by_bus(departures, blocks, min_fleet)],
+        "num_buses": num_buses,
+        "dropped": int((buses < 0).sum()),
+    }
+
+
+def weekly_fleet(start_time, end_time, peak_intervals, off_peak_intervals, peak_hours, num_buses, road_time):
+    """
+    Размер парка на каждый день недели.
+
+    :return: Словарь: "days" - результаты day_fleet по дням, "min_fleet" - нужно автобусов на неделю,
+             "dropped" - всего пропущенных отправлений при num_buses автобусах
+    """
+    days = {day: day_fleet(day, start_time, end_time, peak_intervals, off_peak_intervals, peak_hours, num_buses,
+                           road_time)
+            for day in range(7)}
+    return {
+        "days": days,
+        "min_fleet": max(result["min_fleet"] for result in days.values()),
+        "dropped": sum(result["dropped"] for result in days.values()),
+    }
+
+
+def print_fleet(report, blocks=True):
+    """Выводит размер парка по дням и, если blocks, отправления каждого автобуса минимального парка."""
+    for day, result in report["days"].items():
+        print(f"День {day}: отправлений {result['planned']}, нужно автобусов {result['min_fleet']}, "
+              f"при {result['num_buses']} автобусах пропущено {result['dropped']}")
+        if blocks:
+            for bus, block in enumerate(result["blocks"]):
+                times = ", ".join(f"{minute // 60 % 24:02d}:{minute % 60:02d}" for minute in block)
+                print(f"  Автобус {bus}: {times}")
+    print(f"Нужно автобусов: {report['min_fleet']}, пропущено отправлений за неделю: {report['dropped']}")
@@ -0,0 +1,527 @@
+import heapq
+import logging
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from .bounds import format_bounds, schedule_bounds
+from .drivers import DRIVER_TYPES, Driver, shift_fits
+from .timetable import from_minutes, to_minutes
+
+logger = logging.getLogger(__name__)
+
+# Параметры задачи
+WORK_HOURS = 21  # Часы работы (с 6:00 до 3:00)
+START_HOUR = 6   # Начало работы автобусов
+END_HOUR = 3     # Конец работы автобусов (следующего дня)
+DAYS_IN_WEEK = 7  # Количество дней в неделе
+PEAK_HOURS = [(7, 9), (17, 19)]  # Часы пик (утро и вечер)
+MAX_HOURS_A = 9  # Максимальное количество часов работы для Типа A
+MAX_HOURS_B = 12  # Максимальное количество часов работы для Типа B
+TRIP_DURATION = 1  # Длительность поездки в часах
+
+# Ограничения для Типа A
+TYPE_A_START = 7  # Начало работы Типа A
+TYPE_A_END = 19  # Конец работы Типа A
+
+# Интервалы отправления автобусов
+INTERVAL_NORMAL = 20  # Интервал в обычное время (в минутах)
+INTERVAL_PEAK = 10    # Интервал в часы пик (в минутах)
+
+
+class ShiftDriver:
+    """Водитель жадного алгоритма: отработанные за день минуты и минута, до которой он занят."""
+
+    __slots__ = ("id", "type", "minutes_worked", "busy_until", "last_worked_day")
+
+    def __init__(self, driver_id, driver_type):
+        self.id = driver_id
+        self.type = driver_type
+        self.minutes_worked = 0
+        self.busy_until = -1
+        self.last_worked_day = -3  # Используется только для типа B
+
+
+class Bus:
+    """Автобус и минута, до которой он занят."""
+
+    __slots__ = ("id", "busy_until")
+
+    def __init__(self, bus_id):
+        self.id = bus_id
+        self.busy_until = -1
+
+
+# Норма часов для каждого типа водителей
+DAILY_HOURS_A = MAX_HOURS_A
+DAILY_HOURS_B = MAX_HOURS_B
+
+TRIP_MINUTES = TRIP_DURATION * 60  # Длительность поездки в минутах
+DAILY_MINUTES = {"A": DAILY_HOURS_A * 60, "B": DAILY_HOURS_B * 60}
+
+
+def is_peak_hour(hour):
+    """Проверяет, является ли указанный час часом пик."""
+    for start, end in PEAK_HOURS:
+        if start <= hour < end:
+            return True
+    return False
+
+
+def is_type_a_available(day, hour):
+    """Проверяет доступность водителей Типа A."""
+    if day % DAYS_IN_WEEK >= 5:  # Тип A работает только по будням (дни с 0 до 4)
+        return False
+    if hour < TYPE_A_START or hour >= TYPE_A_END:  # Ограничение по времени
+        return False
+    return True
+
+
+class ShiftSimulator:
+    """
+    Событийная модель жадного алгоритма с точностью до минуты.
+
+    Водители и автобусы принадлежат экземпляру, поэтому сценарии считаются независимо.
+    Освобождение автобусов и водителей - события в кучах (минута, номер); из свободных
+    берется объект с наименьшим номером, как при переборе списка по порядку. Автобус и водитель
+    свободны, если отправление строго позже их прибытия, как в scheduler.drivers. Время считается
+    в минутах от полуночи дня расписания, рейсы после полуночи (next_day) остаются в том же
+    рабочем дне водителя, а доступность Типа A проверяется по календарному дню.
+    """
+
+    def __init__(self, num_buses=8, num_drivers_a=5, num_drivers_b=5):
+        self.drivers = {
+            "A": [ShiftDriver(i + 1, "A") for i in range(num_drivers_a)],  # Водители Типа A
+            "B": [ShiftDriver(i + 1, "B") for i in range(num_drivers_b)],  # Водители Типа B
+        }
+        self.buses = [Bus(i + 1) for i in range(num_buses)]
+        self.dropped = 0  # Отправления без автобуса за все дни
+        self._start_day(0)
+
+    def _start_day(self, day):
+        """Сбрасывает часы работы водителей и освобождает автобусы в начале нового дня."""
+        for drivers in self.drivers.values():
+            for driver in drivers:
+                driver.minutes_worked = 0
+                driver.busy_until = -1
+        for bus in self.buses:
+            bus.busy_until = -1
+
+        self.free_buses = list(range(len(self.buses)))
+        self.busy_buses = []  # (минута освобождения, номер автобуса)
+        self.free = {
+            "A": list(range(len(self.drivers["A"]))),
+            # Правило "раз в три дня" для Типа B
+            "B": [i for i, driver in enumerate(self.drivers["B"]) if day - driver.last_worked_day >= 3],
+        }
+        self.busy = {"A": [], "B": []}  # (минута освобождения, номер водителя)
+
+    def _take_bus(self, minute):
+        while self.busy_buses and self.busy_buses[0][0] < minute:
+            heapq.heappush(self.free_buses, heapq.heappop(self.busy_buses)[1])
+        if not self.free_buses:
+            return None
+        index = heapq.heappop(self.free_buses)
+        bus = self.buses[index]
+        bus.busy_until = minute + TRIP_MINUTES
+        heapq.heappush(self.busy_buses, (bus.busy_until, index))
+        return bus
+
+    def _take_driver(self, driver_type, day, minute):
+        busy = self.busy[driver_type]
+        free = self.free[driver_type]
+        while busy and busy[0][0] < minute:
+            heapq.heappush(free, heapq.heappop(busy)[1])
+        if not free:
+            return None
+        return self._occupy(driver_type, heapq.heappop(free), day, minute)
+
+    def _new_driver(self, driver_type, day, minute):
+        drivers = self.drivers[driver_type]
+        drivers.append(ShiftDriver(len(drivers) + 1, driver_type))
+        return self._occupy(driver_type, len(drivers) - 1, day, minute)
+
+    def _occupy(self, driver_type, index, day, minute):
+        driver = self.drivers[driver_type][index]
+        driver.minutes_worked += TRIP_MINUTES
+        driver.busy_until = minute + TRIP_MINUTES
+        driver.last_worked_day = day
+        # Водитель, выработавший норму, больше не освобождается в этот день
+        if driver.minutes_worked + TRIP_MINUTES <= DAILY_MINUTES[driver_type]:
+            heapq.heappush(self.busy[driver_type], (driver.busy_until, index))
+        return driver
+
+    def run_day(self, day):
+        """
+        Расписание одного дня: список отправлений с автобусом и водителем.
+        Если для отправления нет свободного автобуса, оно пропускается и попадает в лог.
+        """
+        self._start_day(day)
+        day_schedule = []
+        dropped = 0  # Отправления, для которых не нашлось автобуса
+
+        for hour in range(START_HOUR, START_HOUR + WORK_HOURS):
+            current_hour = hour % 24  # Преобразуем часы в формат от 0 до 23
+            next_day = (hour >= 24)  # Проверяем, переходит ли время на следующий день
+            calendar_day = day + 1 if next_day else day
+
+            interval = INTERVAL_PEAK if is_peak_hour(current_hour) and day % DAYS_IN_WEEK < 5 else INTERVAL_NORMAL
+
+            for minute in range(0, 60, interval):
+                departure = hour * 60 + minute  # Минуты от полуночи дня расписания
+                bus_assigned = self._take_bus(departure)
+                if bus_assigned is None:
+                    dropped += 1
+                    continue
+
+                type_a = is_type_a_available(calendar_day, current_hour)
+                driver_assigned = self._take_driver("A", day, departure) if type_a else None
+                if driver_assigned is None:
+                    driver_assigned = self._take_driver("B", day, departure)
+                if driver_assigned is None:
+                    driver_assigned = self._new_driver("A" if type_a else "B", day, departure)
+
+                day_schedule.append({
+                    "hour": current_hour,
+                    "minute": minute,
+                    "driver_id": driver_assigned.id,
+                    "driver_type": driver_assigned.type,
+                    "bus_id": bus_assigned.id
+                })
+
+        if dropped:
+            logger.warning("День %d: не хватает автобусов, пропущено %d отправлений (автобусов %d)",
+                           day, dropped, len(self.buses))
+        self.dropped += dropped
+        return day_schedule
+
+
+def iter_schedule(days=DAYS_IN_WEEK, start_day=0, simulator=None):
+    """
+    Генерирует расписание по одному дню с учётом типов водителей, их ограничений и интервалов отправления
+    автобусов. Номер дня не сбрасывается в начале недели (день недели - day % DAYS_IN_WEEK), поэтому правило
+    "раз в три дня" для Типа B соблюдается и на стыке недель.
+
+    :param simulator: ShiftSimulator сценария (по умолчанию новый)
+    """
+    if simulator is None:
+        simulator = ShiftSimulator()
+    for day in range(start_day, start_day + days):  # Проходим по каждому дню горизонта
+        yield simulator.run_day(day)
+
+
+def generate_schedule(days=DAYS_IN_WEEK, simulator=None):
+    """
+    Генерирует расписание на days дней (по умолчанию на неделю).
+    """
+    return list(iter_schedule(days, simulator=simulator))
+
+def print_schedule(schedule):
+    """
+    Выводит расписание в виде таблицы. Строки - отправления первого дня,
+    для остальных дней показаны автобус и водитель в то же время.
+    """
+    import pandas as pd
+    from tabulate import tabulate  # Для красивого вывода таблицы
+
+    rows = {(entry['hour'], entry['minute']): row for row, entry in enumerate(schedule[0])}
+    table = {
+        "Отправление": [f"{hour:02d}:{minute:02d}" for hour, minute in rows],
+        "Прибытие": [f"{(hour + TRIP_DURATION) % WORK_HOURS:02d}:{minute:02d}" for hour, minute in rows],
+    }
+
+    for day_index, day_schedule in enumerate(schedule):
+        buses = [float('nan')] * len(rows)
+        drivers = [float('nan')] * len(rows)
+        for entry in day_schedule:
+            row = rows.get((entry['hour'], entry['minute']))
+            if row is not None:
+                buses[row] = f"Bus {entry['bus_id']}"
+                drivers[row] = f"{entry['driver_id']} {entry['driver_type']}"
+        table[f"А {day_index}"] = buses
+        table[f"В {day_index}"] = drivers
+
+    print(tabulate(pd.DataFrame(table), headers='keys', tablefmt="grid"))
+
+
+# Генетический алгоритм распределения водителей
+
+# Веса штрафов фитнес-функции (чем меньше значение, тем лучше расписание)
+PENALTY_DRIVER = 1000  # За каждого задействованного водителя
+PENALTY_OVERTIME = 10  # За каждую минуту сверх дневной нормы
+PENALTY_VIOLATION = 5000  # За каждое нарушение правил
+
+_problem = None  # Рейсы и типы водителей в процессе, который строит и оценивает потомков
+_slices = None  # Границы дней в рейсах _problem
+
+
+def trips_from_drivers(drivers):
+    """
+    Переводит результат assign_drivers_to_schedule в задачу для генетического алгоритма.
+
+    :param drivers: Список водителей Driver с назначенными маршрутами
+    :return: Рейсы (день, начало, конец, автобус) в минутах, типы водителей и хромосома,
+             в которой для каждого рейса записан номер водителя
+    """
+    trips = []
+    for index, driver in enumerate(drivers):
+        for day, bus_id, start_time, end_time in driver.routes:
+            trips.append((day, to_minutes(start_time), to_minutes(end_time), bus_id, index))
+    trips.sort()
+    driver_types = [driver.type for driver in drivers]
+    genes = [trip[4] for trip in trips]
+    return [trip[:4] for trip in trips], driver_types, genes
+
+
+def drivers_from_genes(trips, driver_types, genes):
+    """
+    Собирает список водителей Driver по хромосоме. Неиспользованные водители отбрасываются,
+    номера водителей каждого типа идут подряд с единицы.
+    """
+    drivers = {}
+    next_id = {"A": 1, "B": 1}
+    for (day, start, end, bus_id), gene in zip(trips, genes):
+        if gene not in drivers:
+            driver_type = driver_types[gene]
+            drivers[gene] = Driver(next_id[driver_type], driver_type)
+            next_id[driver_type] += 1
+        drivers[gene].assign_route(day, bus_id, from_minutes(start), from_minutes(end))
+    return sorted(drivers.values(), key=lambda driver: (driver.type, driver.id))
+
+
+def fitness(genes, problem=None):
+    """
+    Штраф хромосомы: число водителей, переработка и нарушения правил
+    (окно работы и будни для типа A, пересечения рейсов, правило "раз в три дня" для типа B).
+    """
+    trips, driver_types = problem or _problem
+    shifts = {}  # (водитель, день) -> [начало первого рейса, конец последнего рейса]
+    last_day = {}
+    violations = 0
+
+    for (day, start, end, _), gene in zip(trips, genes):
+        key = (gene, day)
+        shift = shifts.get(key)
+        if shift is None:
+            if driver_types[gene] == 'A' and (day % DAYS_IN_WEEK >= 5 or not 6 <= (start // 60) % 24 < 8):
+                violations += 1
+            previous = last_day.get(gene)
+            if driver_types[gene] == 'B' and previous is not None and day - previous < 2:
+                violations += 1
+            last_day[gene] = day
+            shifts[key] = [start, end]
+            shift = shifts[key]
+        else:
+            if start <= shift[1]:
+                violations += 1  # Пересечение с предыдущим рейсом
+            shift[1] = end
+        if driver_types[gene] == 'A' and not 1 <= (end // 60) % 24 <= 18:
+            violations += 1
+
+    overtime = 0
+    for (gene, _), (first_start, last_end) in shifts.items():
+        overtime += max(0, last_end - first_start - DRIVER_TYPES[driver_types[gene]]["work_max"])
+
+    return PENALTY_DRIVER * len(last_day) + PENALTY_OVERTIME * overtime + PENALTY_VIOLATION * violations
+
+
+def _init_worker(trips, driver_types):
+    global _problem, _slices
+    _problem = (trips, driver_types)
+    _slices = _day_slices(trips)
+
+
+def _day_slices(trips):
+    """Границы рейсов каждого дня в отсортированном списке рейсов."""
+    slices = []
+    first = 0
+    for i in range(1, len(trips) + 1):
+        if i == len(trips) or trips[i][0] != trips[first][0]:
+            slices.append((first, i))
+            first = i
+    return slices
+
+
+def _crossover(rng, parent_a, parent_b, slices):
+    """Дочерняя хромосома получает назначения каждого дня целиком от одного из родителей."""
+    child = []
+    for first, last in slices:
+        child.extend((parent_a if rng.random() < 0.5 else parent_b)[first:last])
+    return child
+
+
+def _mutate(rng, genes, trips, driver_types, mutation_rate):
+    """
+    Переносит случайные рейсы в смены других водителей этого дня и пытается освободить малозагруженного
+    водителя, передав каждую его смену другому водителю (слияние смен или перенос в его выходной).
+    Рейс или смена переходят только к водителю, у которого смена остается допустимой (shift_fits),
+    поэтому мутации не добавляют нарушений.
+    """
+    genes = list(genes)
+    shifts = {}  # Водитель -> день -> номера рейсов по времени
+    for i, ((day, _, _, _), gene) in enumerate(zip(trips, genes)):
+        shifts.setdefault(gene, {}).setdefault(day, []).append(i)
+
+    def fits(target, day, indices):
+        return shift_fits(driver_types[target], day, [trips[i][1:] for i in indices], shifts[target])
+
+    def move(indices, source, target, day):
+        merged = sorted(shifts[target].get(day, []) + indices)
+        if not fits(target, day, merged):
+            return False
+        remaining = [i for i in shifts[source][day] if i not in indices]
+        if remaining:
+            shifts[source][day] = remaining
+        else:
+            del shifts[source][day]
+            if not shifts[source]:
+                del shifts[source]
+        shifts[target][day] = merged
+        for i in indices:
+            genes[i] = target
+        return True
+
+    for i in range(len(genes)):
+        if rng.random() < mutation_rate:
+            day = trips[i][0]
+            targets = [gene for gene in shifts if gene != genes[i] and day in shifts[gene]]
+            rng.shuffle(targets)
+            for target in targets:
+                if move([i], genes[i], target, day):
+                    break
+
+    if shifts and rng.random() < 0.5:
+        # Освобождаем малозагруженного водителя: каждая его смена переходит другому водителю, если подходит
+        candidates = rng.sample(sorted(shifts), min(3, len(shifts)))
+        source = min(candidates, key=lambda gene: sum(len(indices) for indices in shifts[gene].values()))
+        targets = [gene for gene in sorted(shifts) if gene != source]
+        for day in sorted(shifts[source]):
+            rng.shuffle(targets)
+            for target in targets:
+                if move(list(shifts[source][day]), source, target, day):
+                    break
+    return genes
+
+
+def _tournament(rng, population, scores, size=3):
+    best = min(rng.sample(range(len(population)), min(size, len(population))), key=lambda i: scores[i])
+    return population[best]
+
+
+def _child_rng(seed, generation, index):
+    """Генератор потомка index в поколении generation: результат не зависит от того, какой процесс его строит."""
+    return random.Random(f"{seed}:{generation}:{index}")
+
+
+def _breed(task, problem=None, slices=None):
+    """
+    Строит и оценивает одного потомка: турнирный отбор родителей, скрещивание и мутация.
+
+    :param task: Популяция, ее штрафы, зерно, номер поколения, номер потомка и вероятность мутации
+    :return: Хромосома потомка и ее штраф
+    """
+    population, scores, seed, generation, index, mutation_rate = task
+    trips, driver_types = problem or _problem
+    rng = _child_rng(seed, generation, index)
+    child = _crossover(rng, _tournament(rng, population, scores), _tournament(rng, population, scores),
+                       slices or _slices)
+    child = _mutate(rng, child, trips, driver_types, mutation_rate)
+    return child, fitness(child, (trips, driver_types))
+
+
+def evolve(trips, driver_types, seed_genes, population_size=40, generations=100, mutation_rate=0.02, elite=2,
+           seed=0, workers=None):
+    """
+    Улучшает распределение водителей генетическим алгоритмом.
+
+    :param trips: Рейсы (день, начало, конец, автобус), отсортированные по дню и времени
+    :param driver_types: Тип каждого водителя, номер водителя - индекс в списке
+    :param seed_genes: Исходная хромосома (например, из trips_from_drivers)
+    :param population_size: Размер популяции
+    :param generations: Количество поколений
+    :param mutation_rate: Вероятность переназначить отдельный рейс
+    :param elite: Сколько лучших хромосом переходит в следующее поколение без изменений
+    :param seed: Зерно генератора случайных чисел, при одном зерне результат одинаков
+                 (и не зависит от количества процессов)
+    :param workers: Количество процессов, которые строят и оценивают потомков (None - по числу ядер)
+    :return: Лучшая хромосома и ее штраф
+    """
+    population = [list(seed_genes)]
+    while len(population) < population_size:
+        population.append(_mutate(_child_rng(seed, 0, len(population)), seed_genes, trips, driver_types,
+                                  mutation_rate))
+
+    elite = min(elite, population_size)
+    if workers == 1:
+        executor = None
+        problem = (trips, driver_types)
+        evaluate = partial(map, partial(fitness, problem=problem))
+        breed = partial(map, partial(_breed, problem=problem, slices=_day_slices(trips)))
+    else:
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                       initargs=(trips, driver_types))
+        # Задачи одного пакета ссылаются на одну популяцию, поэтому она передается один раз на пакет
+        chunksize = max(1, population_size // (4 * (workers or os.cpu_count() or 1)))
+        evaluate = partial(executor.map, fitness, chunksize=chunksize)
+        breed = partial(executor.map, _breed, chunksize=chunksize)
+
+    try:
+        scores = list(evaluate(population))
+        for generation in range(1, generations + 1):
+            ranked = sorted(range(len(population)), key=lambda i: scores[i])[:elite]
+            tasks = [(population, scores, seed, generation, index, mutation_rate)
+                     for index in range(elite, population_size)]
+            children = list(breed(tasks))
+            population = [population[i] for i in ranked] + [child for child, _ in children]
+            scores = [scores[i] for i in ranked] + [score for _, score in children]
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    best = min(range(len(population)), key=lambda i: scores[i])
+    return population[best], scores[best]
+
+
+def optimize_drivers(drivers, **kwargs):
+    """
+    Улучшает результат assign_drivers_to_schedule генетическим алгоритмом.
+    Параметры передаются в evolve.
+
+    :return: Новый список водителей Driver
+    """
+    trips, driver_types, genes = trips_from_drivers(drivers)
+    best, _ = evolve(trips, driver_types, genes, **kwargs)
+    return drivers_from_genes(trips, driver_types, best)
+
+
+def schedule_trips(schedule):
+    """
+    Переводит расписание generate_schedule в рейсы (отправление, прибытие, автобус) по дням,
+    как в weekly_trips. Часы до START_HOUR относятся к ночи после дня расписания.
+    """
+    days = []
+    for day, day_schedule in enumerate(schedule):
+        trips = []
+        for entry in day_schedule:
+            hour = entry["hour"] + (24 if entry["hour"] < START_HOUR else 0)
+            departure = hour * 60 + entry["minute"]
+            trips.append([from_minutes(departure), from_minutes(departure + TRIP_DURATION * 60), entry["bus_id"]])
+        days.append((day, trips))
+    return days
+
+
+def main():
+    schedule = generate_schedule()
+    print("Сгенерированное расписание:")
+    print_schedule(schedule)
+
+    days = schedule_trips(schedule)
+    # Заранее созданные водители, не получившие ни одного рейса, не учитываются
+    drivers_used = len({(entry["driver_type"], entry["driver_id"]) for day_schedule in schedule
+                        for entry in day_schedule})
+    buses_used = len({trip[2] for _, trips in days for trip in trips})
+    print(format_bounds(schedule_bounds(days), drivers_used, buses_used))
+
+if __name__ == "__main__":
+    main()
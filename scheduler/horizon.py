@@ -0,0 +1,48 @@
+"""
+Планирование на произвольный горизонт (например, квартал) с выдачей расписания по дням.
+
+Расписание автобусов и назначение водителей строятся день за днем. Состояние водителей
+(последний рабочий день, отработанные минуты) переносится через границы недель,
+а в памяти остаются только маршруты последних history_days дней.
+"""
+from .drivers import DriverAssigner
+from .timetable import MINUTES_IN_DAY, day_timetable, day_trips, to_minutes
+
+
+def iter_rolling_schedule(start_time, end_time, peak_intervals, off_peak_intervals, peak_hours, num_buses, road_time,
+                          days, start_day=0, history_days=7, assigner=None):
+    """
+    Генератор расписаний по дням.
+
+    Дни нумеруются от понедельника первой недели (день недели - day % 7), номер дня
+    не сбрасывается в начале недели, поэтому правило отдыха водителей типа B
+    выполняется и на стыке недель. Рейсы после полуночи относятся к дню, в который
+    начался рабочий день, и дополнительно передаются следующему дню в "carried".
+
+    :param days: Количество дней горизонта
+    :param start_day: Номер первого дня (0 - понедельник)
+    :param history_days: Сколько последних дней маршрутов хранить у водителей (не меньше 2)
+    :param assigner: DriverAssigner, чтобы продолжить уже начатое планирование
+    :return: Для каждого дня словарь: "day", "weekday", "trips" - список рейсов
+             (отправление, прибытие, автобус, водитель) в минутах от полуночи дня,
+             водитель - пара (тип, номер), "carried" - рейсы предыдущего дня после полуночи
+    """
+    if history_days < 2:
+        raise ValueError("Для правила отдыха водителей типа B нужна история минимум за 2 дня")
+    if assigner is None:
+        assigner = DriverAssigner()
+
+    carried = []
+    for day in range(start_day, start_day + days):
+        departures, buses = day_timetable(day, start_time, end_time, peak_intervals, off_peak_intervals, peak_hours,
+                                          num_buses, road_time)
+        routes = day_trips(departures, buses, road_time)
+        assigned = assigner.assign_day(day, routes)
+
+        trips = [(to_minutes(departure), to_minutes(arrival), bus, (driver.type, driver.id))
+                 for (departure, arrival, bus), driver in zip(routes, assigned)]
+        yield {"day": day, "weekday": day % 7, "trips": trips, "carried": carried}
+
+        carried = [(departure - MINUTES_IN_DAY, arrival - MINUTES_IN_DAY, bus, driver)
+                   for departure, arrival, bus, driver in trips if departure >= MINUTES_IN_DAY]
+        assigner.forget_before(day + 2 - history_days)
@@ -0,0 +1,219 @@
+"""
+Улучшение готового распределения водителей локальным поиском с ограничением по времени.
+
+Поиск принимает только ходы, которые уменьшают стоимость, поэтому текущее решение всегда
+лучшее из найденных и его можно вернуть в любой момент, когда закончится время.
+Стоимость сравнивается по порядку: число водителей, неоплачиваемые простои внутри смен
+(длина смены минус время в рейсах), затем "сосредоточенность" рабочих дней (сумма квадратов
+числа рабочих дней водителей) - она направляет перенос смен к уже загруженным водителям.
+Ход меняет смены двух водителей в один день, поэтому стоимость пересчитывается только по ним.
+"""
+import time
+
+from .drivers import DRIVER_TYPES, Driver, shift_fits
+from .timetable import from_minutes
+
+
+def _idle(trips):
+    """Простой внутри смены: длина смены минус время в рейсах."""
+    if not trips:
+        return 0
+    return trips[-1][1] - trips[0][0] - sum(end - start for start, end, _ in trips)
+
+
+class _Solution:
+    """Смены водителей по дням и составляющие стоимости, которые обновляются при каждом изменении смены."""
+
+    def __init__(self, drivers):
+        self.types = [driver.type for driver in drivers]
+        self.shifts = [{} for _ in drivers]  # Для каждого водителя: день -> рейсы (начало, конец, автобус)
+        for index, driver in enumerate(drivers):
+            for day, bus_id, start, end in zip(driver.route_days, driver.route_buses, driver.route_starts,
+                                               driver.route_ends):
+                self.shifts[index].setdefault(day, []).append((start, end, bus_id))
+        for shifts in self.shifts:
+            for trips in shifts.values():
+                trips.sort()
+
+        self.active = sum(1 for shifts in self.shifts if shifts)
+        self.idle = sum(_idle(trips) for shifts in self.shifts for trips in shifts.values())
+        self.spread = sum(len(shifts) ** 2 for shifts in self.shifts)
+
+    def cost(self):
+        return self.active, self.idle, -self.spread
+
+    def set_shift(self, driver, day, trips):
+        """
+        Заменяет смену водителя на день (пустой список - выходной) и обновляет стоимость.
+
+        :return: Запись для отмены изменения
+        """
+        shifts = self.shifts[driver]
+        old = shifts.get(day, [])
+        days_before = len(shifts)
+        if trips:
+            shifts[day] = trips
+        else:
+            shifts.pop(day, None)
+        days_after = len(shifts)
+
+        self.idle += _idle(trips) - _idle(old)
+        self.spread += days_after ** 2 - days_before ** 2
+        self.active += (days_after > 0) - (days_before > 0)
+        return driver, day, old
+
+    def undo(self, log):
+        for driver, day, trips in reversed(log):
+            self.set_shift(driver, day, trips)
+
+    def fits(self, driver, day, trips):
+        return shift_fits(self.types[driver], day, trips, self.shifts[driver])
+
+    def drivers(self):
+        """Собирает водителей Driver; номера водителей каждого типа идут подряд с единицы."""
+        result = []
+        next_id = {driver_type: 1 for driver_type in DRIVER_TYPES}
+        for driver_type, shifts in sorted(zip(self.types, self.shifts), key=lambda item: item[0]):
+            if not shifts:
+                continue
+            driver = Driver(next_id[driver_type], driver_type)
+            next_id[driver_type] += 1
+            for day in sorted(shifts):
+                for start, end, bus_id in shifts[day]:
+                    driver.assign_route(day, bus_id, from_minutes(start), from_minutes(end))
+            result.append(driver)
+        return result
+
+
+def _merge(solution, donor):
+    """
+    Пытается освободить водителя: его смены целиком переходят к водителям, свободным в этот день,
+    а если таких нет - рейсы по одному добавляются в смены других водителей.
+    Если освободить не удалось или стоимость не уменьшилась, изменения отменяются.
+    """
+    before = solution.cost()
+    log = []
+    others = [index for index, shifts in enumerate(solution.shifts) if shifts and index != donor]
+    # Сначала самые загруженные: так рабочие дни сосредотачиваются у меньшего числа водителей
+    others.sort(key=lambda index: -len(solution.shifts[index]))
+
+    for day, trips in sorted(solution.shifts[donor].items()):
+        target = next((index for index in others
+                       if day not in solution.shifts[index] and solution.fits(index, day, trips)), None)
+        if target is not None:
+            log.append(solution.set_shift(donor, day, []))
+            log.append(solution.set_shift(target, day, trips))
+            continue
+
+        for trip in trips:
+            best = None
+            for index in others:
+                current = solution.shifts[index].get(day)
+                if current is None:
+                    continue
+                candidate = sorted(current + [trip])
+                if solution.fits(index, day, candidate):
+                    added = _idle(candidate) - _idle(current)
+                    if best is None or added < best[0]:
+                        best = (added, index, candidate)
+            if best is None:
+                solution.undo(log)
+                return False
+            log.append(solution.set_shift(best[1], day, best[2]))
+            remaining = [other for other in solution.shifts[donor][day] if other != trip]
+            log.append(solution.set_shift(donor, day, remaining))
+
+    if solution.cost() < before:
+        return True
+    solution.undo(log)
+    return False
+
+
+def _swap_tails(solution, first, second, day):
+    """
+    Обмен хвостами смен двух водителей в один день: рейсы после момента разреза меняются местами.
+    Применяется первый разрез, уменьшающий стоимость.
+    """
+    trips_first = solution.shifts[first][day]
+    trips_second = solution.shifts[second][day]
+    cuts = sorted({trip[0] for trip in trips_first} | {trip[0] for trip in trips_second})
+    before = solution.cost()
+    for cut in cuts[1:]:
+        new_first = [trip for trip in trips_first if trip[0] < cut] + [trip for trip in trips_second if trip[0] >= cut]
+        new_second = [trip for trip in trips_second if trip[0] < cut] + [trip for trip in trips_first if trip[0] >= cut]
+        if new_first == trips_first or not solution.fits(first, day, new_first) \
+                or not solution.fits(second, day, new_second):
+            continue
+        log = [solution.set_shift(first, day, new_first), solution.set_shift(second, day, new_second)]
+        if solution.cost() < before:
+            return True
+        solution.undo(log)
+    return False
+
+
+def _rechain(solution, donor, day):
+    """
+    Переносит смену дня к водителю, свободному в этот день (для типа B - с соблюдением отдыха),
+    если стоимость уменьшается: так рабочие дни собираются у меньшего числа водителей.
+    """
+    trips = solution.shifts[donor][day]
+    before = solution.cost()
+    for target, shifts in enumerate(solution.shifts):
+        if target == donor or not shifts or day in shifts or len(shifts) < len(solution.shifts[donor]):
+            continue
+        if not solution.fits(target, day, trips):
+            continue
+        log = [solution.set_shift(donor, day, []), solution.set_shift(target, day, trips)]
+        if solution.cost() < before:
+            return True
+        solution.undo(log)
+    return False
+
+
+def improve_drivers(drivers, time_budget=1.0):
+    """
+    Улучшает распределение водителей локальным поиском.
+
+    Ходы: освобождение малозагруженных водителей (merge), обмен хвостами смен в один день,
+    перенос смен к водителям, свободным в этот день (в том числе пересборка дней отдыха типа B).
+    Исходные водители не изменяются.
+
+    :param drivers: Список водителей Driver (например, из assign_drivers_to_schedule)
+    :param time_budget: Ограничение по времени в секундах; по его окончании возвращается лучшее найденное решение
+    :return: Новый список водителей
+    """
+    deadline = time.perf_counter() + time_budget
+    solution = _Solution(drivers)
+
+    improved = True
+    while improved and time.perf_counter() < deadline:
+        improved = False
+
+        # Освобождаем водителей, начиная с наименее загруженных
+        load = sorted((index for index, shifts in enumerate(solution.shifts) if shifts),
+                      key=lambda index: sum(len(trips) for trips in solution.shifts[index].values()))
+        for donor in load:
+            if time.perf_counter() >= deadline:
+                break
+            if solution.shifts[donor] and _merge(solution, donor):
+                improved = True
+
+        for donor in range(len(solution.shifts)):
+            for day in sorted(solution.shifts[donor]):
+                if time.perf_counter() >= deadline:
+                    break
+                if day in solution.shifts[donor] and _rechain(solution, donor, day):
+                    improved = True
+
+        days = sorted({day for shifts in solution.shifts for day in shifts})
+        for day in days:
+            working = [index for index, shifts in enumerate(solution.shifts) if day in shifts]
+            for position, first in enumerate(working):
+                if time.perf_counter() >= deadline:
+                    break
+                for second in working[position + 1:]:
+                    if day in solution.shifts[first] and day in solution.shifts[second] \
+                            and _swap_tails(solution, first, second, day):
+                        improved = True
+
+    return solution.drivers()
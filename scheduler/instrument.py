@@ -0,0 +1,127 @@
+"""
+Необязательные замеры работы планировщика: время этапов, счетчики проверок правил и профилирование этапа.
+
+Пока замеры не включены (enable), функции модуля только проверяют одну глобальную переменную.
+Результат выгружается в JSON (Metrics.to_json) для системы метрик.
+"""
+import json
+import time
+from contextlib import contextmanager
+
+# Причины, по которым водитель не может взять маршрут (Driver.rejection_reason)
+REASONS = ("type_a_window", "type_b_rest", "daily_max", "overlap")
+
+_metrics = None  # Текущие замеры, None - замеры выключены
+
+
+class Metrics:
+    """
+    Собранные замеры.
+
+    :param count_rules: Считать вызовы Driver.can_take_route и отказы по причинам.
+                        Индексированный поиск водителей не проверяет водителей по одному, поэтому
+                        при включенных счетчиках используется перебор списка (результат тот же, но медленнее)
+    :param profilers: Словарь: этап -> функция без аргументов, создающая профилировщик
+                      (cProfile.Profile или объект с методами start/stop)
+    """
+
+    def __init__(self, count_rules=False, profilers=None):
+        self.count_rules = count_rules
+        self.profilers = dict(profilers or {})
+        self.phases = {}  # Этап -> суммарное время (в секундах)
+        self.phase_runs = {}  # Этап -> количество запусков
+        self.counters = {}
+        if count_rules:
+            self.counters["can_take_route.calls"] = 0
+            for reason in REASONS:
+                self.counters[f"can_take_route.rejected.{reason}"] = 0
+        self.profiles = {}  # Этап -> профилировщик (один на этап, включается при каждом запуске этапа)
+
+    def add(self, name, value=1):
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def to_dict(self):
+        return {
+            "phases_s": {name: round(seconds, 6) for name, seconds in self.phases.items()},
+            "phase_runs": dict(self.phase_runs),
+            "counters": dict(self.counters),
+        }
+
+    def to_json(self):
+        return json.dumps(self.to_dict(), indent=2, ensure_ascii=False, sort_keys=True)
+
+
+def enable(count_rules=False, profilers=None):
+    """Включает замеры и возвращает объект, в который они собираются."""
+    global _metrics
+    _metrics = Metrics(count_rules, profilers)
+    return _metrics
+
+
+def disable():
+    """Выключает замеры и возвращает собранное (или None)."""
+    global _metrics
+    metrics, _metrics = _metrics, None
+    return metrics
+
+
+def active():
+    return _metrics
+
+
+def counting_rules():
+    return _metrics is not None and _metrics.count_rules
+
+
+def count(name, value=1):
+    """Увеличивает счетчик, если замеры включены."""
+    if _metrics is not None:
+        _metrics.add(name, value)
+
+
+def count_rule(reason):
+    """Учитывает вызов Driver.can_take_route с результатом проверки (None - маршрут подходит)."""
+    _metrics.add("can_take_route.calls")
+    if reason is not None:
+        _metrics.add(f"can_take_route.rejected.{reason}")
+
+
+@contextmanager
+def phase(name):
+    """
+    Замеряет время этапа. Если для этапа задан профилировщик, он работает только внутри этапа;
+    при повторных запусках этапа включается тот же профилировщик, и статистика накапливается.
+    """
+    metrics = _metrics
+    if metrics is None:
+        yield
+        return
+
+    profiler = metrics.profiles.get(name)
+    if profiler is None and name in metrics.profilers:
+        profiler = metrics.profiles[name] = metrics.profilers[name]()
+    if profiler is not None:
+        _start_profiler(profiler)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        if profiler is not None:
+            _stop_profiler(profiler)
+        metrics.phases[name] = metrics.phases.get(name, 0.0) + elapsed
+        metrics.phase_runs[name] = metrics.phase_runs.get(name, 0) + 1
+
+
+def _start_profiler(profiler):
+    if hasattr(profiler, "enable"):  # cProfile.Profile
+        profiler.enable()
+    else:  # Семплирующие профилировщики
+        profiler.start()
+
+
+def _stop_profiler(profiler):
+    if hasattr(profiler, "disable"):
+        profiler.disable()
+    else:
+        profiler.stop()
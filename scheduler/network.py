@@ -0,0 +1,340 @@
+"""
+Планирование сети маршрутов с общими водителями.
+
+У каждого маршрута свои параметры расписания (как в DEFAULTS) и депо. Расписания маршрутов
+строятся параллельно в пуле процессов, затем водители из общего пула распределяются по рейсам
+всех маршрутов сразу: водитель может перейти на другой маршрут того же депо через время пересменки
+(relief), а на маршрут другого депо - еще и через время перегона (deadhead).
+
+Распределение жадное, как в DriverAssigner: рейсы дня по времени отправления, водитель берется из куч
+освободившихся водителей по маршруту и по депо, поэтому на рейс тратится O((1 + депо) log n) вместо перебора
+всех водителей.
+
+Пример запуска:
+    python -m scheduler.network --config network.json --workers 4 --days 7 --export network.bin
+
+Файл сети (JSON): {"relief": 10, "deadhead": 30, "lines": [{"name": "12", "depot": "Север", "num_buses": 10}, ...]};
+deadhead - число или словарь {"депо": {"депо": минуты}}, в маршрутах не заданные параметры берутся из DEFAULTS.
+"""
+import argparse
+import heapq
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .cli import DEFAULTS, parse_peak_hours
+from .drivers import DRIVER_TYPES
+from .storage import RECORD_DTYPE
+from .timetable import day_timetable
+
+RELIEF = 10  # Пересменка при переходе на другой маршрут (в минутах)
+DEADHEAD = 30  # Перегон между депо по умолчанию (в минутах)
+PROBES = 8  # Сколько освободившихся водителей проверить в одной куче, прежде чем искать дальше
+
+
+class Line:
+    """
+    Маршрут сети.
+
+    :param name: Название маршрута
+    :param depot: Депо, к которому относится маршрут
+    :param params: Параметры расписания (ключи как в DEFAULTS), не заданные берутся из DEFAULTS
+    """
+
+    def __init__(self, name, depot="main", **params):
+        unknown = set(params) - set(DEFAULTS)
+        if unknown:
+            raise ValueError(f"Маршрут {name}: неизвестные параметры {', '.join(sorted(unknown))}")
+        self.name = str(name)
+        self.depot = str(depot)
+        self.params = {**DEFAULTS, **params}
+        self.params["peak_hours"] = parse_peak_hours(self.params["peak_hours"])
+
+
+def load_network(path):
+    """
+    Читает сеть из JSON-файла.
+
+    :return: Тройка: список Line, время пересменки, время перегона (число или словарь по депо)
+    """
+    with open(path, encoding="utf-8") as file:
+        config = json.load(file)
+    lines = [Line(**line) for line in config["lines"]]
+    return lines, config.get("relief", RELIEF), config.get("deadhead", DEADHEAD)
+
+
+def _line_timetables(params, days):
+    return [day_timetable(day, **params) for day in days]
+
+
+def line_timetables(lines, days, workers=None):
+    """
+    Строит расписания маршрутов по дням в пуле процессов.
+
+    :param days: Номера дней (день недели - day % 7)
+    :param workers: Количество процессов (None - по числу ядер, 1 - без пула)
+    :return: Для каждого маршрута список пар массивов (отправления, автобусы) по дням (см. bus_timetable)
+    """
+    days = list(days)
+    if workers == 1:
+        return [_line_timetables(line.params, days) for line in lines]
+    # Маршруты передаются пачками: расчет одного маршрута короче пересылки задания
+    chunksize = max(1, len(lines) // (4 * (workers or os.cpu_count() or 1)))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(_line_timetables, [line.params for line in lines], [days] * len(lines),
+                                 chunksize=chunksize))
+
+
+def network_trips(lines, timetables, days):
+    """
+    Собирает рейсы всех маршрутов в записи RECORD_DTYPE без водителей (driver = -1).
+    Отправления без автобуса не попадают в рейсы.
+
+    :return: Записи, отсортированные по (день, отправление, маршрут)
+    """
+    parts = []
+    for line_index, (line, line_days) in enumerate(zip(lines, timetables)):
+        for day, (departures, buses) in zip(days, line_days):
+            served = buses >= 0
+            part = np.empty(int(served.sum()), dtype=RECORD_DTYPE)
+            part["day"] = day
+            part["line"] = line_index
+            part["departure"] = departures[served]
+            part["arrival"] = departures[served] + line.params["road_time"]
+            part["bus"] = buses[served]
+            part["driver"] = -1
+            parts.append(part)
+
+    records = np.concatenate(parts) if parts else np.empty(0, dtype=RECORD_DTYPE)
+    return records[np.lexsort((records["line"], records["departure"], records["day"]))]
+
+
+def deadhead_matrix(depots, deadhead=DEADHEAD):
+    """
+    Время перегона между депо.
+
+    :param depots: Названия депо
+    :param deadhead: Число (одинаково для всех пар) или словарь {"депо": {"депо": минуты}};
+                     не заданные пары берут обратное направление, иначе DEADHEAD
+    :return: Матрица минут (на диагонали 0)
+    """
+    if not isinstance(deadhead, dict):
+        matrix = np.full((len(depots), len(depots)), int(deadhead), dtype=np.int64)
+    else:
+        matrix = np.full((len(depots), len(depots)), DEADHEAD, dtype=np.int64)
+        for i, source in enumerate(depots):
+            for j, target in enumerate(depots):
+                value = deadhead.get(source, {}).get(target, deadhead.get(target, {}).get(source))
+                if value is not None:
+                    matrix[i, j] = value
+    np.fill_diagonal(matrix, 0)
+    return matrix
+
+
+class NetworkAssigner:
+    """
+    Жадное распределение общего пула водителей по рейсам сети, которое можно продолжать день за днем.
+
+    Водитель, закончивший рейс, лежит в куче своего маршрута (может взять следующий рейс сразу после прибытия)
+    и в куче своего депо (другой маршрут депо - после пересменки). Для другого депо к пересменке добавляется
+    перегон. Записи в кучах не удаляются, а устаревают: у водителя есть счетчик назначений, запись с другим
+    значением счетчика пропускается.
+
+    :param line_depots: Номер депо для каждого маршрута
+    :param relief: Время пересменки (в минутах)
+    :param deadhead: Матрица перегонов между депо (см. deadhead_matrix)
+    """
+
+    def __init__(self, line_depots, relief=RELIEF, deadhead=None):
+        self.line_depots = list(line_depots)
+        self.num_depots = max(self.line_depots, default=-1) + 1
+        self.relief = relief
+        self.deadhead = deadhead if deadhead is not None else deadhead_matrix(range(self.num_depots))
+        self.types = []  # Тип каждого водителя
+        self.labels = []  # (тип, номер) каждого водителя
+        self.last_day = []  # Последний рабочий день
+        self.next_id = {driver_type: 1 for driver_type in DRIVER_TYPES}
+        self.day = None
+
+    def _start_day(self, day):
+        self.day = day
+        self.shift_start = {}  # Водитель -> начало смены сегодня
+        self.stamps = {}  # Водитель -> счетчик назначений сегодня
+        self.line_heaps = {}  # (тип, маршрут) -> [(окончание последнего рейса, водитель, счетчик)]
+        self.depot_heaps = {}  # (тип, депо) -> [(окончание последнего рейса, водитель, счетчик)]
+        # Водители, которые могут начать день: тип A - в будни, тип B - если отдыхал вчера
+        self.fresh = {driver_type: [] for driver_type in DRIVER_TYPES}
+        for index, (driver_type, last_day) in enumerate(zip(self.types, self.last_day)):
+            if driver_type == 'A' and day % 7 < 5 or driver_type == 'B' and last_day + 2 <= day:
+                self.fresh[driver_type].append(index)
+
+    def _fits(self, driver_type, shift_start, start, end):
+        """Проверяет, что смена с рейсом укладывается в норму, а тип A заканчивает рейс в разрешенные часы."""
+        if end - shift_start > DRIVER_TYPES[driver_type]["work_max"]:
+            return False
+        return driver_type != 'A' or 1 <= end // 60 % 24 <= 18
+
+    def _search(self, heap, driver_type, delay, start, end):
+        """
+        Ищет в куче водителя, свободного строго раньше start с учетом задержки delay.
+        Водители, для которых рейс начинается позже конца смены, убираются из куч до конца дня.
+        """
+        work_max = DRIVER_TYPES[driver_type]["work_max"]
+        aside = []
+        found = -1
+        while heap and heap[0][0] + delay < start and len(aside) < PROBES:
+            entry = heapq.heappop(heap)
+            _, index, stamp = entry
+            if stamp != self.stamps[index]:
+                continue
+            if start - self.shift_start[index] > work_max:
+                self.stamps[index] += 1  # Смена закончилась: записи в других кучах тоже устаревают
+                continue
+            if self._fits(driver_type, self.shift_start[index], start, end):
+                found = index
+                break
+            aside.append(entry)
+        for entry in aside:
+            heapq.heappush(heap, entry)
+        return found
+
+    def _find(self, driver_type, line, start, end):
+        """Работающий сегодня водитель: сначала с того же маршрута, затем из того же депо, затем из других."""
+        depot = self.line_depots[line]
+        index = self._search(self.line_heaps.get((driver_type, line), []), driver_type, 0, start, end)
+        if index >= 0:
+            return index
+        index = self._search(self.depot_heaps.get((driver_type, depot), []), driver_type, self.relief, start, end)
+        if index >= 0:
+            return index
+        for other in range(self.num_depots):
+            if other != depot:
+                heap = self.depot_heaps.get((driver_type, other), [])
+                delay = self.relief + int(self.deadhead[other, depot])
+                index = self._search(heap, driver_type, delay, start, end)
+                if index >= 0:
+                    return index
+        return -1
+
+    def _start_shift(self, driver_type, start, end):
+        """Водитель, начинающий смену с этого рейса: еще не работавший сегодня или новый."""
+        if not self._fits(driver_type, start, start, end):
+            return -1
+        if driver_type == 'A' and not 6 <= start // 60 % 24 < 8:
+            return -1
+        if self.fresh[driver_type]:
+            return heapq.heappop(self.fresh[driver_type])
+        return self._new_driver(driver_type)
+
+    def _new_driver(self, driver_type):
+        self.types.append(driver_type)
+        self.labels.append((driver_type, self.next_id[driver_type]))
+        self.last_day.append(-2)
+        self.next_id[driver_type] += 1
+        return len(self.types) - 1
+
+    def assign_day(self, day, lines, departures, arrivals):
+        """
+        Назначает водителей на рейсы одного дня. Дни должны идти по возрастанию.
+
+        :param lines: Номера маршрутов рейсов
+        :param departures: Отправления (в минутах), по возрастанию
+        :param arrivals: Прибытия (в минутах)
+        :return: Массив номеров водителей (в self.labels) в порядке рейсов
+        """
+        self._start_day(day)
+        weekday = day % 7 < 5
+        assigned = np.empty(len(departures), dtype=np.int64)
+        for position, (line, start, end) in enumerate(zip(lines.tolist(), departures.tolist(), arrivals.tolist())):
+            index = -1
+            # Тип A - только в будни, затем тип B, новый водитель B - в любом случае
+            if weekday:
+                index = self._find('A', line, start, end)
+                if index < 0:
+                    index = self._start_shift('A', start, end)
+            if index < 0:
+                index = self._find('B', line, start, end)
+            if index < 0:
+                index = self._start_shift('B', start, end)
+            if index < 0:
+                index = self._new_driver('B')
+
+            driver_type = self.types[index]
+            if index not in self.shift_start:
+                self.shift_start[index] = start
+                self.stamps[index] = 0
+                self.last_day[index] = day
+            self.stamps[index] += 1
+            entry = (end, index, self.stamps[index])
+            heapq.heappush(self.line_heaps.setdefault((driver_type, line), []), entry)
+            heapq.heappush(self.depot_heaps.setdefault((driver_type, self.line_depots[line]), []), entry)
+            assigned[position] = index
+        return assigned
+
+
+def assign_network(records, line_depots, relief=RELIEF, deadhead=None):
+    """
+    Распределяет водителей общего пула по рейсам сети (заполняет поле "driver").
+
+    :param records: Записи RECORD_DTYPE, отсортированные по (день, отправление)
+    :param line_depots: Номер депо для каждого маршрута
+    :return: Подписи водителей (тип, номер) по номерам из поля "driver"
+    """
+    assigner = NetworkAssigner(line_depots, relief, deadhead)
+    days = records["day"]
+    bounds = np.flatnonzero(np.r_[True, days[1:] != days[:-1], True]) if len(records) else []
+    for first, last in zip(bounds[:-1], bounds[1:]):
+        day_records = records[first:last]
+        records["driver"][first:last] = assigner.assign_day(int(days[first]), day_records["line"],
+                                                            day_records["departure"], day_records["arrival"])
+    return assigner.labels
+
+
+def plan_network(lines, days=range(7), relief=RELIEF, deadhead=DEADHEAD, workers=None):
+    """
+    Расписания всех маршрутов и распределение общего пула водителей.
+
+    :param lines: Список Line
+    :param days: Номера дней
+    :param deadhead: Перегон между депо (число или словарь, см. deadhead_matrix)
+    :return: Записи RECORD_DTYPE и подписи водителей (тип, номер)
+    """
+    depots = sorted({line.depot for line in lines})
+    days = list(days)
+    records = network_trips(lines, line_timetables(lines, days, workers), days)
+    labels = assign_network(records, [depots.index(line.depot) for line in lines], relief,
+                            deadhead_matrix(depots, deadhead))
+    return records, labels
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Расписание сети маршрутов с общим пулом водителей")
+    parser.add_argument("--config", required=True, help="JSON-файл сети")
+    parser.add_argument("--days", type=int, default=7, help="количество дней от понедельника")
+    parser.add_argument("--workers", type=int, help="процессов для расписаний маршрутов")
+    parser.add_argument("--export", help="файл для расписания в двоичном формате (scheduler.storage)")
+    args = parser.parse_args(argv)
+
+    lines, relief, deadhead = load_network(args.config)
+    records, labels = plan_network(lines, range(args.days), relief, deadhead, args.workers)
+
+    # Водители, работавшие на нескольких маршрутах
+    pairs = np.unique(np.stack([records["driver"], records["line"]]), axis=1)
+    shared = int((np.bincount(pairs[0], minlength=len(labels)) > 1).sum())
+    num_a = sum(driver_type == "A" for driver_type, _ in labels)
+    print(f"Маршрутов: {len(lines)}, рейсов: {len(records)}, водителей: {len(labels)} "
+          f"(A: {num_a}, B: {len(labels) - num_a}), на нескольких маршрутах: {shared}")
+
+    if args.export:
+        from .storage import write_records
+
+        # В файле рейсы дня идут по маршрутам
+        order = np.lexsort((records["departure"], records["line"], records["day"]))
+        write_records(args.export, records[order], [(-1, driver_type, driver_id) for driver_type, driver_id in labels],
+                      [line.name for line in lines])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Вывод расписаний в виде таблиц.
+
+pandas и tabulate загружаются только при вызове функций этого модуля,
+чтобы расчет расписания не тратил время на их импорт.
+"""
+from .timetable import EPOCH, MINUTES_IN_DAY, to_minutes
+
+
+def _after_midnight(minute):
+    """Рейс до 06:00 по часам показывается в таблице следующего дня."""
+    return (minute // 60) % 24 < 6
+
+
+def _clock(minute):
+    return f"{minute // 60 % 24:02d}:{minute % 60:02d}"
+
+
+def _spread(table_days, departures, keys, columns, row_day, num_days):
+    """
+    Собирает широкую таблицу одним проходом по записям.
+
+    Строки таблицы - записи дня row_day, упорядоченные по времени суток (порядок равных сохраняется).
+    Для каждого дня значения записей раскладываются по строкам с тем же ключом, в отсутствующих
+    ячейках остается None.
+
+    :param table_days: День таблицы для каждой записи
+    :param departures: Время отправления каждой записи в минутах
+    :param keys: Ключ каждой записи (время отправления в минутах или пара отправление-прибытие)
+    :param columns: Столбцы значений записей
+    :return: Номера записей-строк и для каждого дня список столбцов по строкам
+    """
+    rows = [i for i, day in enumerate(table_days) if day == row_day]
+    rows.sort(key=lambda i: departures[i] % MINUTES_IN_DAY)
+    position = {keys[i]: row for row, i in enumerate(rows)}
+
+    spread = [[[None] * len(rows) for _ in columns] for _ in range(num_days)]
+    for i, (day, key) in enumerate(zip(table_days, keys)):
+        row = position.get(key)
+        if row is not None and day < num_days:
+            for cells, column in zip(spread[day], columns):
+                cells[row] = column[i]
+    return rows, spread
+
+
+def _bus_column(values):
+    """Номера автобусов: целые, а при пропусках - дробные с NaN, как после pd.merge."""
+    import pandas as pd
+
+    return pd.Series(values, dtype='float64' if None in values else 'int64')
+
+
+def weekly_bus_table(weekly_schedule, road_time):
+    """
+    Таблица отправлений на неделю с номерами автобусов по дням.
+    Рейсы после полуночи переносятся в таблицу следующего дня (рейсы воскресенья - в понедельник).
+    Строки таблицы - рейсы понедельника.
+    """
+    import pandas as pd
+
+    table_days = []
+    departures = []
+    buses = []
+    for day, schedule in weekly_schedule.items():
+        for bus, bus_schedule in enumerate(schedule):
+            for departure in bus_schedule:
+                minute = to_minutes(departure)
+                table_days.append((day + 1) % 7 if _after_midnight(minute) else day)
+                departures.append(minute)
+                buses.append(bus)
+
+    rows, spread = _spread(table_days, departures, departures, [buses], 0, 7)
+    row_departures = [departures[i] for i in rows]
+
+    table = {
+        'Отправление': pd.to_datetime(row_departures, unit='m', origin=EPOCH),
+        'Прибытие': pd.to_datetime([minute + road_time for minute in row_departures], unit='m', origin=EPOCH),
+    }
+    for day in range(7):
+        table[f'Номер автобуса {day}'] = _bus_column(spread[day][0])
+    return pd.DataFrame(table)
+
+
+def format_table(df, tablefmt):
+    """Форматирует таблицу в текст."""
+    from tabulate import tabulate
+
+    return tabulate(df, headers='keys', tablefmt=tablefmt)
+
+
+def print_drivers(drivers):
+    """Выводит маршруты каждого водителя."""
+    for driver in drivers:
+        print(f"Водитель {driver.id} (Тип {driver.type}):")
+        for day, bus_id, departure, arrival in driver.routes:
+            print(f"  День {day}, Автобус {bus_id}: {departure.time()} - {arrival.time()}")
+        print(f"  Всего отработано минут за неделю: {driver.total_minutes_worked}")
+        print()
+
+
+def weekly_driver_table(drivers):
+    """
+    Таблица рейсов на неделю с автобусом и водителем по дням.
+    Рейсы после полуночи переносятся в таблицу следующего дня, строки таблицы - рейсы вторника.
+    """
+    import pandas as pd
+
+    table_days = []
+    departures = []
+    arrivals = []
+    buses = []
+    labels = []
+    for driver in drivers:
+        label = f'{driver.id} {driver.type}'
+        for day, bus, departure, arrival in driver.routes:
+            minute = to_minutes(departure)
+            table_days.append(day + 1 if _after_midnight(minute) else day)
+            departures.append(minute)
+            arrivals.append(to_minutes(arrival))
+            buses.append(bus)
+            labels.append(label)
+
+    keys = list(zip(departures, arrivals))
+    rows, spread = _spread(table_days, departures, keys, [buses, labels], 1, 7)
+
+    table = {
+        'Отправление': [_clock(departures[i]) for i in rows],
+        'Прибытие': [_clock(arrivals[i]) for i in rows],
+    }
+    for day in range(7):
+        day_buses, day_labels = spread[day]
+        table[f'А {day}'] = _bus_column(day_buses)
+        table[f'В {day}'] = [float('nan') if label is None else label for label in day_labels]
+    return pd.DataFrame(table)
@@ -0,0 +1,113 @@
+"""
+Точечное исправление распределения водителей после изменений в течение дня.
+
+Вместо повторного запуска assign_drivers_to_schedule на всю неделю
+затрагиваются только водители и дни, которых касаются изменения.
+"""
+from .drivers import Driver
+
+
+def _trip_key(day, bus_id, start_time):
+    return day, bus_id, start_time
+
+
+def repair_assignment(drivers, cancelled=(), added=(), retimed=(), unavailable=()):
+    """
+    Исправляет существующее распределение водителей (список изменяется на месте).
+
+    Рейс определяется тройкой (день, автобус, отправление). Освободившиеся рейсы
+    (перенесенные, новые, рейсы заболевших водителей) назначаются так же, как в
+    assign_drivers_to_schedule: сначала водители типа A по будням, затем типа B,
+    затем новый водитель. Проверки дневной нормы, окна работы типа A и отдыха типа B
+    выполняются с учетом всех уже назначенных маршрутов водителя.
+
+    :param drivers: Список водителей из assign_drivers_to_schedule
+    :param cancelled: Отмененные рейсы (день, автобус, отправление)
+    :param added: Новые рейсы (день, автобус, отправление, прибытие)
+    :param retimed: Перенесенные рейсы ((день, автобус, отправление), новое отправление, новое прибытие)
+    :param unavailable: Пары (водитель, день): водитель не выходит в этот день
+    :return: Словарь: "assigned" - список (рейс, водитель) для переназначенных рейсов,
+             "unknown" - рейсы из изменений, которых нет в расписании,
+             "new_drivers" - добавленные водители
+    """
+    owners = {}
+    for driver in drivers:
+        for day, bus_id, start_time, _ in driver.routes:
+            owners[_trip_key(day, bus_id, start_time)] = driver
+
+    orphans = list(added)
+    unknown = []
+
+    removed = set(cancelled)
+    for trip, start_time, end_time in retimed:
+        removed.add(trip)
+        # Перенесенный рейс ставится заново, только если исходный рейс есть в расписании
+        if _trip_key(*trip) in owners:
+            orphans.append((trip[0], trip[1], start_time, end_time))
+
+    # Убираем отмененные и перенесенные рейсы у их водителей
+    by_driver = {}
+    for trip in removed:
+        driver = owners.get(_trip_key(*trip))
+        if driver is None:
+            unknown.append(trip)
+        else:
+            by_driver.setdefault(id(driver), (driver, set()))[1].add(_trip_key(*trip))
+    for driver, keys in by_driver.values():
+        days = {key[0] for key in keys}
+        driver.remove_routes(lambda route: _trip_key(*route[:3]) in keys)
+        for day in days:
+            orphans.extend(_release_if_invalid(driver, day))
+
+    # Рейсы водителей, которые не выходят на работу, тоже нужно переназначить
+    blocked = set()
+    for driver, day in unavailable:
+        blocked.add((id(driver), day))
+        for route in driver.remove_routes(lambda route: route[0] == day):
+            orphans.append(route)
+
+    orphans.sort(key=lambda trip: (trip[0], trip[2]))
+    next_id = {"A": 1, "B": 1}
+    for driver in drivers:
+        next_id[driver.type] = max(next_id[driver.type], driver.id + 1)
+
+    assigned = []
+    new_drivers = []
+    for day, bus_id, start_time, end_time in orphans:
+        driver = _find_driver(drivers, blocked, day, start_time, end_time)
+        if driver is None:
+            driver = Driver(next_id["A"], "A")
+            if day % 7 >= 5 or not driver.can_insert_route(day, start_time, end_time):
+                driver = Driver(next_id["B"], "B")
+            next_id[driver.type] += 1
+            drivers.append(driver)
+            new_drivers.append(driver)
+        driver.insert_route(day, bus_id, start_time, end_time)
+        assigned.append(((day, bus_id, start_time, end_time), driver))
+
+    return {"assigned": assigned, "unknown": unknown, "new_drivers": new_drivers}
+
+
+def _release_if_invalid(driver, day):
+    """
+    После удаления первого рейса смена типа A может начаться позже 08:00.
+    Тогда все рейсы этого дня снимаются с водителя и переназначаются.
+    """
+    if driver.type != 'A':
+        return []
+    day_routes = [route for route in driver.routes if route[0] == day]
+    if not day_routes or 6 <= min(route[2] for route in day_routes).hour < 8:
+        return []
+    return driver.remove_routes(lambda route: route[0] == day)
+
+
+def _find_driver(drivers, blocked, day, start_time, end_time):
+    """Первый подходящий водитель: тип A (только по будням), затем тип B."""
+    types = ("A", "B") if day % 7 < 5 else ("B",)
+    for driver_type in types:
+        for driver in drivers:
+            if driver.type != driver_type or (id(driver), day) in blocked:
+                continue
+            if driver.can_insert_route(day, start_time, end_time):
+                return driver
+    return None
@@ -0,0 +1,265 @@
+"""
+Долго работающий сервис планирования (asyncio, HTTP по TCP или Unix-сокету).
+
+Одинаковые запросы, которые уже считаются, не запускаются повторно: все ждут один результат.
+Расчеты выполняются в пуле процессов, готовые результаты хранятся в LRU-кэше.
+Если в работе слишком много расчетов, новые запросы получают 503, а запрос, не дождавшийся
+результата за timeout секунд, - 504 (расчет при этом продолжается и попадет в кэш).
+
+Пример запуска:
+    python -m scheduler.service --port 8080
+    curl -d '{"num_buses": 10}' http://127.0.0.1:8080/schedule
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from .bounds import schedule_bounds
+from .cli import DEFAULTS, parse_peak_hours
+from .drivers import assign_drivers_to_schedule
+from .timetable import create_weekly_bus_schedule, timetable_key, weekly_trips
+
+OPTIONS = {"algorithm": "basic", "generations": 100, "seed": 0}  # Параметры алгоритма и значения по умолчанию
+# Допустимые значения числовых параметров (включительно): больше не нужно на практике,
+# а огромные значения заняли бы процесс пула надолго
+LIMITS = {
+    "peak_intervals": (1, 24 * 60),
+    "off_peak_intervals": (1, 24 * 60),
+    "road_time": (1, 24 * 60),
+    "num_buses": (0, 1000),
+    "generations": (0, 10000),
+}
+STATUS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 500: "Internal Server Error",
+          503: "Service Unavailable", 504: "Gateway Timeout"}
+
+
+def parse_request(payload):
+    """
+    Проверяет запрос и дополняет его значениями по умолчанию.
+
+    :param payload: Словарь с параметрами расписания (как в DEFAULTS) и алгоритма (как в OPTIONS)
+    :return: Словарь {"params": ..., "algorithm": ..., "generations": ..., "seed": ...}
+    """
+    if not isinstance(payload, dict):
+        raise ValueError("Ожидается JSON-объект")
+    unknown = set(payload) - set(DEFAULTS) - set(OPTIONS)
+    if unknown:
+        raise ValueError(f"Неизвестные параметры: {', '.join(sorted(unknown))}")
+
+    params = {name: payload.get(name, value) for name, value in DEFAULTS.items()}
+    try:
+        params["peak_hours"] = parse_peak_hours(params["peak_hours"])
+        # Ключ расписания проверяет время "HH:MM" (parse_minutes) и приводит числа; ошибка здесь - ошибка клиента
+        timetable_key(**params)
+    except (TypeError, ValueError, AttributeError) as error:
+        raise ValueError(f"Некорректные параметры расписания: {error}") from error
+
+    request = {name: payload.get(name, value) for name, value in OPTIONS.items()}
+    if request["algorithm"] not in ("basic", "genetic"):
+        raise ValueError(f"Неизвестный алгоритм: {request['algorithm']}")
+    if not isinstance(request["seed"], int) or isinstance(request["seed"], bool) or request["seed"] < 0:
+        raise ValueError("seed: ожидается неотрицательное целое число")
+    for name, (low, high) in LIMITS.items():
+        value = params.get(name, request.get(name))
+        if not isinstance(value, int) or isinstance(value, bool):
+            raise ValueError(f"{name}: ожидается целое число")
+        if not low <= value <= high:
+            raise ValueError(f"{name}: ожидается значение от {low} до {high}")
+    request["params"] = params
+    return request
+
+
+def request_key(request):
+    """Ключ запроса: одинаковые по смыслу параметры расписания дают один ключ (см. timetable_key)."""
+    key = (timetable_key(**request["params"]), request["algorithm"])
+    if request["algorithm"] == "genetic":
+        key += (request["generations"], request["seed"])
+    return key
+
+
+def compute(request):
+    """
+    Строит недельное расписание и распределяет водителей. Выполняется в процессе пула.
+
+    :return: Словарь для ответа: количество рейсов и водителей, нижние оценки и маршруты водителей
+             (день, автобус, отправление, прибытие; время в минутах от полуночи дня)
+    """
+    params = request["params"]
+    days = weekly_trips(create_weekly_bus_schedule(**params), params["road_time"])
+    drivers = assign_drivers_to_schedule(days)
+    if request["algorithm"] == "genetic":
+        from .genetic import optimize_drivers
+
+        drivers = optimize_drivers(drivers, generations=request["generations"], seed=request["seed"], workers=1)
+
+    bounds = schedule_bounds(days)
+    return {
+        "trips": sum(len(trips) for _, trips in days),
+        "drivers_used": len(drivers),
+        "drivers_a": sum(driver.type == "A" for driver in drivers),
+        "drivers_b": sum(driver.type == "B" for driver in drivers),
+        "bounds": {"drivers": bounds["drivers"], "buses": bounds["buses"]},
+        "drivers": [
+            {"id": driver.id, "type": driver.type,
+             "routes": [list(route) for route in zip(driver.route_days, driver.route_buses, driver.route_starts,
+                                                     driver.route_ends)]}
+            for driver in drivers
+        ],
+    }
+
+
+def _warm_up():
+    return os.getpid()
+
+
+class SchedulingService:
+    """
+    Обработка запросов планирования.
+
+    :param workers: Количество процессов пула (None - по числу ядер)
+    :param max_pending: Сколько разных расчетов может выполняться одновременно, сверх этого - 503
+    :param timeout: Сколько секунд запрос ждет результата, после этого - 504
+    :param cache_size: Сколько готовых результатов хранить
+    """
+
+    def __init__(self, workers=None, max_pending=32, timeout=30.0, cache_size=256):
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.cache_size = cache_size
+        # spawn: процессы пула не наследуют открытые соединения сервера (при fork клиент не получил бы EOF)
+        self.workers = workers or os.cpu_count() or 1
+        self.executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"))
+        self.inflight = {}  # Ключ запроса -> future расчета
+        self.results = OrderedDict()
+        self.coalesced = 0  # Запросы, которые присоединились к уже идущему расчету
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    async def warm_up(self):
+        """Запускает процессы пула и импортирует в них модули расчета до первого запроса."""
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self.executor, _warm_up) for _ in range(self.workers)))
+
+    async def schedule(self, request):
+        """
+        Результат запроса: из кэша, из уже идущего расчета или из нового расчета.
+
+        :return: Пара (HTTP-статус, тело ответа)
+        """
+        key = request_key(request)
+        result = self.results.get(key)
+        if result is not None:
+            self.results.move_to_end(key)
+            return 200, result
+
+        future = self.inflight.get(key)
+        if future is not None:
+            self.coalesced += 1
+        else:
+            if len(self.inflight) >= self.max_pending:
+                return 503, {"error": "Слишком много расчетов, повторите позже"}
+            future = asyncio.get_running_loop().run_in_executor(self.executor, compute, request)
+            self.inflight[key] = future
+            future.add_done_callback(partial(self._finish, key))
+
+        try:
+            # shield: тайм-аут одного запроса не отменяет расчет для остальных
+            return 200, await asyncio.wait_for(asyncio.shield(future), self.timeout)
+        except asyncio.TimeoutError:
+            return 504, {"error": f"Расчет не уложился в {self.timeout} с"}
+        except ValueError as error:
+            return 400, {"error": str(error)}
+
+    def _finish(self, key, future):
+        self.inflight.pop(key, None)
+        if future.cancelled() or future.exception() is not None:
+            return
+        self.results[key] = future.result()
+        while len(self.results) > self.cache_size:
+            self.results.popitem(last=False)
+
+    async def dispatch(self, method, target, body):
+        """Маршрутизация: GET /health, POST /schedule."""
+        if target == "/health":
+            return 200, {"status": "ok", "inflight": len(self.inflight), "cached": len(self.results),
+                         "coalesced": self.coalesced}
+        if target != "/schedule":
+            return 404, {"error": f"Нет ресурса {target}"}
+        if method != "POST":
+            return 405, {"error": "Ожидается POST"}
+        try:
+            request = parse_request(json.loads(body or b"{}"))
+        except (ValueError, TypeError) as error:
+            return 400, {"error": str(error)}
+        return await self.schedule(request)
+
+    async def handle(self, reader, writer):
+        """Один HTTP-запрос на соединение."""
+        try:
+            method, target, _ = (await reader.readline()).decode("latin-1").split(" ", 2)
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+            body = await reader.readexactly(int(headers.get("content-length", 0)))
+        except (ValueError, asyncio.IncompleteReadError):
+            status, payload = 400, {"error": "Некорректный HTTP-запрос"}
+        else:
+            try:
+                status, payload = await self.dispatch(method, target, body)
+            except Exception as error:  # Ошибка расчета не должна останавливать сервис
+                status, payload = 500, {"error": repr(error)}
+
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        writer.write(f"HTTP/1.1 {status} {STATUS[status]}\r\n"
+                     f"Content-Type: application/json; charset=utf-8\r\n"
+                     f"Content-Length: {len(data)}\r\n"
+                     f"Connection: close\r\n\r\n".encode("latin-1") + data)
+        try:
+            await writer.drain()
+        finally:
+            writer.close()
+
+
+async def serve(service, host="127.0.0.1", port=8080, unix=None):
+    """Запускает сервер на TCP-порту или Unix-сокете и работает до отмены."""
+    await service.warm_up()
+    if unix:
+        server = await asyncio.start_unix_server(service.handle, path=unix)
+    else:
+        server = await asyncio.start_server(service.handle, host, port)
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Сервис планирования расписания")
+    parser.add_argument("--host", default="127.0.0.1", help="адрес")
+    parser.add_argument("--port", type=int, default=8080, help="порт")
+    parser.add_argument("--unix", help="путь к Unix-сокету (вместо TCP)")
+    parser.add_argument("--workers", type=int, help="процессов для расчетов")
+    parser.add_argument("--max-pending", type=int, default=32, help="одновременных расчетов, сверх этого - 503")
+    parser.add_argument("--timeout", type=float, default=30.0, help="тайм-аут запроса в секундах")
+    parser.add_argument("--cache-size", type=int, default=256, help="сколько результатов хранить")
+    args = parser.parse_args(argv)
+
+    service = SchedulingService(args.workers, args.max_pending, args.timeout, args.cache_size)
+    try:
+        asyncio.run(serve(service, args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
+
+
+if __name__ == "__main__":
+    main()
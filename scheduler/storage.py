@@ -0,0 +1,181 @@
+"""
+Двоичный столбцовый формат расписания для других систем (приложение водителя, табло, расчет зарплаты).
+
+Файл: сигнатура MAGIC, длина заголовка (uint32), заголовок в JSON, затем выровненные по ALIGNMENT байт секции:
+записи рейсов (структурированный массив RECORD_DTYPE, отсортирован по дню, маршруту и отправлению),
+номера записей по водителям, границы водителей в этом списке и границы дней. Время - целые минуты от полуночи дня.
+Чтение отображает файл в память (np.memmap), поэтому выборки по дню и маршруту не копируют данные.
+"""
+import json
+import struct
+
+import numpy as np
+
+MAGIC = b"SCHEDCOL"
+VERSION = 1
+ALIGNMENT = 64
+
+RECORD_DTYPE = np.dtype([
+    ("day", "<i4"),  # Номер дня от понедельника
+    ("line", "<i4"),  # Номер маршрута
+    ("departure", "<i4"),  # Отправление (в минутах от полуночи дня)
+    ("arrival", "<i4"),  # Прибытие (в минутах от полуночи дня)
+    ("bus", "<i4"),  # Номер автобуса на маршруте
+    ("driver", "<i4"),  # Номер водителя в заголовке файла
+])
+INDEX_DTYPE = np.dtype("<i8")
+
+
+def _align(offset):
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def schedule_records(lines):
+    """
+    Собирает рейсы из распределений водителей в записи RECORD_DTYPE.
+
+    :param lines: Список распределений по маршрутам: для каждого маршрута список водителей Driver
+    :return: Записи, отсортированные по (день, маршрут, отправление), и подписи водителей (маршрут, тип, номер)
+    """
+    labels = []
+    parts = []
+    for line, drivers in enumerate(lines):
+        for driver in drivers:
+            count = len(driver.route_days)
+            part = np.empty(count, dtype=RECORD_DTYPE)
+            part["day"] = np.frombuffer(driver.route_days, dtype=np.int32)
+            part["line"] = line
+            part["departure"] = np.frombuffer(driver.route_starts, dtype=np.int64)
+            part["arrival"] = np.frombuffer(driver.route_ends, dtype=np.int64)
+            part["bus"] = np.frombuffer(driver.route_buses, dtype=np.int32)
+            part["driver"] = len(labels)
+            labels.append((line, driver.type, driver.id))
+            parts.append(part)
+
+    records = np.concatenate(parts) if parts else np.empty(0, dtype=RECORD_DTYPE)
+    records = records[np.lexsort((records["departure"], records["line"], records["day"]))]
+    return records, labels
+
+
+def write_schedule(path, lines, line_names=None):
+    """
+    Записывает расписание в файл.
+
+    :param lines: Список распределений по маршрутам (для каждого маршрута список водителей Driver)
+    :param line_names: Названия маршрутов (по умолчанию номера)
+    :return: Количество записанных рейсов
+    """
+    records, labels = schedule_records(lines)
+    if line_names is None:
+        line_names = [str(line) for line in range(len(lines))]
+    return write_records(path, records, labels, line_names)
+
+
+def write_records(path, records, labels, line_names):
+    """
+    Записывает готовые записи RECORD_DTYPE в файл.
+
+    :param records: Записи, отсортированные по (день, маршрут, отправление)
+    :param labels: Подписи водителей (маршрут, тип, номер) по номерам из поля "driver";
+                   маршрут -1 - водитель работает на нескольких маршрутах (scheduler.network)
+    :param line_names: Названия маршрутов
+    :return: Количество записанных рейсов
+    """
+    driver_order = np.argsort(records["driver"], kind="stable").astype(INDEX_DTYPE)
+    driver_offsets = np.searchsorted(records["driver"][driver_order], np.arange(len(labels) + 1)).astype(INDEX_DTYPE)
+
+    first_day = int(records["day"][0]) if len(records) else 0
+    last_day = int(records["day"][-1]) if len(records) else -1
+    day_offsets = np.searchsorted(records["day"], np.arange(first_day, last_day + 2)).astype(INDEX_DTYPE)
+
+    sections = [("records", records), ("driver_order", driver_order), ("driver_offsets", driver_offsets),
+                ("day_offsets", day_offsets)]
+    offsets = {}  # Смещения секций от начала данных (после заголовка)
+    position = 0
+    for name, array in sections:
+        offsets[name] = position
+        position = _align(position + array.nbytes)
+
+    header = json.dumps({
+        "version": VERSION,
+        "dtype": RECORD_DTYPE.descr,
+        "count": len(records),
+        "first_day": first_day,
+        "days": last_day - first_day + 1,
+        "lines": list(line_names),
+        "drivers": labels,
+        "sections": offsets,
+    }, ensure_ascii=False).encode("utf-8")
+    data_start = _align(len(MAGIC) + 4 + len(header))
+
+    with open(path, "wb") as file:
+        file.write(MAGIC)
+        file.write(struct.pack("<I", len(header)))
+        file.write(header)
+        for name, array in sections:
+            file.write(b"\0" * (data_start + offsets[name] - file.tell()))
+            file.write(array.tobytes())
+    return len(records)
+
+
+class ScheduleFile:
+    """
+    Расписание, отображенное в память. Выборки по дню и по маршруту в пределах дня - срезы
+    без копирования, выборка по водителю собирает его рейсы по индексу из файла.
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as file:
+            if file.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path}: не файл расписания")
+            (length,) = struct.unpack("<I", file.read(4))
+            header = json.loads(file.read(length).decode("utf-8"))
+        if header["version"] != VERSION:
+            raise ValueError(f"{path}: неподдерживаемая версия {header['version']}")
+
+        data_start = _align(len(MAGIC) + 4 + length)
+        self.path = path
+        self.lines = header["lines"]
+        self.drivers = [tuple(label) for label in header["drivers"]]
+        sections = {name: data_start + offset for name, offset in header["sections"].items()}
+        count = header["count"]
+        dtype = np.dtype([tuple(field) for field in header["dtype"]])
+        self.records = self._map(sections["records"], dtype, count)
+        self.driver_order = self._map(sections["driver_order"], INDEX_DTYPE, count)
+        self.driver_offsets = self._map(sections["driver_offsets"], INDEX_DTYPE, len(self.drivers) + 1)
+        self.first_day = header["first_day"]
+        self.day_offsets = self._map(sections["day_offsets"], INDEX_DTYPE, header["days"] + 1)
+
+    def _map(self, offset, dtype, count):
+        if not count:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(self.path, dtype=dtype, mode="r", offset=offset, shape=(count,))
+
+    def __len__(self):
+        return len(self.records)
+
+    @property
+    def days(self):
+        """Номера дней от первого до последнего."""
+        return range(self.first_day, self.first_day + len(self.day_offsets) - 1)
+
+    def day(self, day, line=None):
+        """Рейсы дня (и маршрута, если задан) - срез без копирования."""
+        index = day - self.first_day
+        if not 0 <= index < len(self.day_offsets) - 1:
+            return self.records[:0]
+        first, last = int(self.day_offsets[index]), int(self.day_offsets[index + 1])
+        if line is None:
+            return self.records[first:last]
+        lines = self.records["line"][first:last]
+        line_first, line_last = np.searchsorted(lines, [line, line + 1])
+        return self.records[first + line_first:first + line_last]
+
+    def line(self, line):
+        """Рейсы маршрута за все дни (копия: в файле маршруты идут внутри дней)."""
+        return self.records[self.records["line"] == line]
+
+    def driver(self, index):
+        """Рейсы водителя по номеру из self.drivers, в порядке дней и отправлений."""
+        first, last = self.driver_offsets[index], self.driver_offsets[index + 1]
+        return self.records[np.asarray(self.driver_order[first:last])]
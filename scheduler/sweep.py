@@ -0,0 +1,150 @@
+"""
+Перебор вариантов параметров расписания ("что, если") с выводом Парето-фронта.
+
+Пример запуска:
+    python -m scheduler.sweep --num-buses 6 8 10 --peak-intervals 5 10 --road-time 45 60 \
+        --peak-hours 7-9,17-19 7-10,16-19 --output sweep.json
+"""
+import argparse
+import json
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import product
+
+from .cli import DEFAULTS, parse_peak_hours
+from .drivers import assign_drivers_to_schedule
+from .timetable import day_timetable, day_trips, timetable_key
+
+AXES = ("num_buses", "peak_intervals", "off_peak_intervals", "road_time", "peak_hours")  # Параметры перебора
+
+
+def make_grid(base=None, **axes):
+    """
+    Строит все сочетания значений параметров.
+
+    :param base: Параметры, общие для всех вариантов (по умолчанию DEFAULTS)
+    :param axes: Списки значений для параметров из AXES, например num_buses=[6, 8]
+    :return: Список словарей параметров
+    """
+    base = dict(DEFAULTS if base is None else base)
+    names = [name for name in AXES if axes.get(name)]
+    return [{**base, **dict(zip(names, values))} for values in product(*(axes[name] for name in names))]
+
+
+def evaluate(params):
+    """
+    Считает один вариант: расписание на неделю и жадное распределение водителей.
+
+    :return: Словарь: параметры, "drivers" (и по типам), "buses" - размер парка,
+             "planned" и "dropped" - запланированные и пропущенные отправления,
+             "service_level" - доля выполненных отправлений
+    """
+    planned = 0
+    dropped = 0
+    days = []
+    for day in range(7):
+        departures, buses = day_timetable(day, **params)
+        planned += len(departures)
+        dropped += int((buses < 0).sum())
+        days.append((day, day_trips(departures, buses, params["road_time"])))
+
+    drivers = assign_drivers_to_schedule(days)
+    num_a = sum(driver.type == "A" for driver in drivers)
+    return {
+        "params": params,
+        "drivers": len(drivers),
+        "drivers_a": num_a,
+        "drivers_b": len(drivers) - num_a,
+        "buses": params["num_buses"],
+        "planned": planned,
+        "dropped": dropped,
+        "service_level": (planned - dropped) / planned if planned else 1.0,
+    }
+
+
+def iter_sweep(points, workers=None):
+    """
+    Считает варианты в пуле процессов и выдает результаты по мере готовности.
+
+    Варианты с одинаковым нормализованным ключом расписания считаются один раз, каждый - отдельной
+    задачей. Задачи идут по порядку ключей, поэтому варианты, отличающиеся только автобусами
+    и временем в пути, обычно попадают в процесс подряд и берут отправления из его кэша.
+
+    :param points: Список параметров (например, из make_grid)
+    :param workers: Количество процессов (None - по числу ядер, 1 - без пула)
+    :return: Генератор результатов evaluate (порядок - по мере готовности)
+    """
+    unique = {}  # ключ расписания -> варианты с этим ключом
+    for params in points:
+        unique.setdefault(timetable_key(**params), []).append(params)
+    keys = sorted(unique)
+
+    def expand(result):
+        for params in unique[timetable_key(**result["params"])]:
+            yield {**result, "params": params}
+
+    if workers == 1:
+        for key in keys:
+            yield from expand(evaluate(unique[key][0]))
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(evaluate, unique[key][0]) for key in keys]
+        for future in as_completed(futures):
+            yield from expand(future.result())
+
+
+def dominates(a, b):
+    """a не хуже b по всем критериям (водители, автобусы, уровень обслуживания) и лучше хотя бы по одному."""
+    no_worse = a["drivers"] <= b["drivers"] and a["buses"] <= b["buses"] and a["service_level"] >= b["service_level"]
+    better = a["drivers"] < b["drivers"] or a["buses"] < b["buses"] or a["service_level"] > b["service_level"]
+    return no_worse and better
+
+
+def pareto_frontier(results):
+    """
+    Недоминируемые результаты: меньше водителей, меньше автобусов, выше уровень обслуживания.
+    Результаты просматриваются по возрастанию водителей, поэтому сравнивать нужно только с уже найденным фронтом.
+    """
+    frontier = []
+    for result in sorted(results, key=lambda item: (item["drivers"], item["buses"], -item["service_level"])):
+        if not any(dominates(best, result) for best in frontier):
+            frontier.append(result)
+    return frontier
+
+
+def _peak_hours_variant(value):
+    """Вариант часов пик из строки "7-9,17-19" (пустая строка - без часов пик)."""
+    return parse_peak_hours([part for part in value.split(",") if part])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Перебор параметров расписания и Парето-фронт")
+    parser.add_argument("--num-buses", type=int, nargs="+", help="количество автобусов")
+    parser.add_argument("--peak-intervals", type=int, nargs="+", help="интервал в час пик (в минутах)")
+    parser.add_argument("--off-peak-intervals", type=int, nargs="+", help="интервал вне часа пик (в минутах)")
+    parser.add_argument("--road-time", type=int, nargs="+", help="время в пути (в минутах)")
+    parser.add_argument("--peak-hours", type=_peak_hours_variant, nargs="+",
+                        help="варианты часов пик, например 7-9,17-19 7-10")
+    parser.add_argument("--workers", type=int, help="количество процессов")
+    parser.add_argument("--output", help="файл для JSON-отчета (по умолчанию stdout)")
+    args = parser.parse_args(argv)
+
+    points = make_grid(**{name: getattr(args, name) for name in AXES})
+    results = []
+    for result in iter_sweep(points, workers=args.workers):
+        results.append(result)
+        print(f"[{len(results)}/{len(points)}] {json.dumps(result['params'], ensure_ascii=False)}: "
+              f"водителей {result['drivers']}, автобусов {result['buses']}, "
+              f"обслуживание {result['service_level']:.1%}", file=sys.stderr)
+
+    text = json.dumps({"results": results, "frontier": pareto_frontier(results)}, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
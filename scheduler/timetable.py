@@ -0,0 +1,430 @@
+import contextlib
+import hashlib
+import heapq
+import logging
+import os
+import tempfile
+import zipfile
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+MINUTES_IN_DAY = 24 * 60
+EPOCH = datetime(1900, 1, 1)  # Дата, которую datetime.strptime дает для "HH:MM"
+
+
+def parse_minutes(value):
+    """
+    Переводит время "HH:MM" в минуты от полуночи.
+    Как и datetime.strptime(value, "%H:%M"), отклоняет часы больше 23 и минуты больше 59.
+    """
+    fields = value.split(":")
+    if len(fields) != 2 or not all(field.isascii() and field.isdigit() and len(field) <= 2 for field in fields):
+        raise ValueError(f"Время {value!r} не в формате HH:MM")
+    hours, minutes = int(fields[0]), int(fields[1])
+    if hours >= 24 or minutes >= 60:
+        raise ValueError(f"Время {value!r} вне суток")
+    return hours * 60 + minutes
+
+
+def to_minutes(value):
+    """
+    Переводит объект времени из create_bus_schedule в минуты от полуночи дня обслуживания.
+    """
+    return int((value - EPOCH).total_seconds() // 60)
+
+
+def from_minutes(minute):
+    """
+    Переводит минуты от полуночи дня обслуживания в объект времени, как в create_bus_schedule.
+    """
+    return EPOCH + timedelta(minutes=minute)
+
+
+def service_window(start_time, end_time):
+    """
+    Возвращает начало и конец работы в минутах от полуночи дня обслуживания.
+    Если конец работы раньше начала, он переносится на следующие сутки.
+    """
+    start = parse_minutes(start_time)
+    end = parse_minutes(end_time)
+    if end < start:
+        end += MINUTES_IN_DAY  # Если конец работы после полуночи
+    return start, end
+
+
+def peak_mask(peak_hours):
+    """
+    Маска часов пик для каждого часа суток (массив из 24 элементов).
+    """
+    hours = np.arange(24)
+    mask = np.zeros(24, dtype=bool)
+    for start_hour, end_hour in peak_hours:
+        mask |= (hours >= start_hour) & (hours < end_hour)
+    return mask
+
+
+def departure_minutes(start, end, peak_intervals, off_peak_intervals, peak_hours):
+    """
+    Вычисляет времена всех отправлений в минутах от полуночи дня обслуживания.
+
+    Интервал выбирается по часу текущего отправления, как и в исходном
+    пошаговом алгоритме. Часы с одинаковым интервалом склеиваются в отрезки,
+    внутри каждого отрезка отправления строятся одним вызовом np.arange.
+
+    :param start: Начало работы (в минутах)
+    :param end: Окончание работы (в минутах, может быть больше суток)
+    :param peak_intervals: Интервал движения в час пик (в минутах)
+    :param off_peak_intervals: Интервал движения в остальное время (в минутах)
+    :param peak_hours: Список часов пик (например, [(7, 9), (17, 19)])
+    :return: Массив отправлений (int64)
+    """
+    if peak_intervals <= 0 or off_peak_intervals <= 0:
+        raise ValueError("Интервал движения должен быть положительным")
+    if end <= start:
+        return np.empty(0, dtype=np.int64)
+
+    # Интервал для каждого часа, который затрагивает окно работы
+    hours = np.arange(start // 60, (end - 1) // 60 + 1)
+    intervals = np.where(peak_mask(peak_hours)[hours % 24], peak_intervals, off_peak_intervals)
+
+    # Границы отрезков с постоянным интервалом
+    change = np.flatnonzero(np.diff(intervals)) + 1
+    run_starts = np.concatenate(([0], change))
+    run_ends = np.append(change, len(hours))
+
+    chunks = []
+    current = start
+    for first, last in zip(run_starts, run_ends):
+        segment_end = min(int(hours[last - 1] + 1) * 60, end)
+        if current >= segment_end:
+            continue
+        interval = int(intervals[first])
+        chunk = np.arange(current, segment_end, interval, dtype=np.int64)
+        chunks.append(chunk)
+        current = int(chunk[-1]) + interval
+
+    if not chunks:
+        return np.empty(0, dtype=np.int64)
+    return np.concatenate(chunks)
+
+
+def assign_buses(departures, num_buses, road_time):
+    """
+    Распределяет отправления по автобусам одним проходом.
+
+    Каждое отправление получает свободный автобус с наименьшим номером
+    (автобус свободен, если отправление строго позже его прибытия).
+    Вместо перебора всех автобусов используются две кучи: свободные номера
+    и занятые автобусы по времени освобождения.
+
+    :param departures: Отсортированный массив отправлений (в минутах)
+    :param num_buses: Количество автобусов
+    :param road_time: Время в пути (в минутах)
+    :return: Массив номеров автобусов, -1 для отправлений без автобуса
+    """
+    buses = np.full(len(departures), -1, dtype=np.int64)
+    free = list(range(num_buses))
+    busy = []  # (время прибытия, номер автобуса)
+
+    for i, departure in enumerate(departures.tolist()):
+        while busy and busy[0][0] < departure:
+            heapq.heappush(free, heapq.heappop(busy)[1])
+        if not free:
+            continue
+        bus = heapq.heappop(free)
+        buses[i] = bus
+        heapq.heappush(busy, (departure + road_time, bus))
+
+    return buses
+
+
+def timetable_key(start_time, end_time, peak_intervals, off_peak_intervals, peak_hours, num_buses, road_time):
+    """
+    Нормализованный ключ параметров расписания: одинаковые по смыслу параметры дают один ключ
+    (часы пик сводятся к маске по часам, а при равных интервалах не учитываются).
+    """
+    start, end = service_window(start_time, end_time)
+    mask = peak_mask(peak_hours)
+    if peak_intervals == off_peak_intervals or not mask.any():
+        mask[:] = False
+        peak_intervals = off_peak_intervals
+    peak = tuple(np.flatnonzero(mask).tolist())  # Номера часов пик
+    return start, end, int(peak_intervals), int(off_peak_intervals), peak, int(num_buses), int(road_time)
+
+
+class TimetableCache:
+    """
+    Кэш дневных расписаний по нормализованным параметрам.
+
+    В памяти хранится не больше maxsize расписаний (вытесняются давно не использованные).
+    Если задан directory, расписания дополнительно сохраняются на диск и переживают перезапуск.
+    Отдельно в памяти хранятся отправления по первой части ключа (без количества автобусов и времени
+    в пути): они общие для вариантов, которые отличаются только парком.
+    Массивы в кэше доступны только для чтения.
+    """
+
+    def __init__(self, maxsize=256, directory=None):
+        self.maxsize = maxsize
+        self.directory = directory
+        self.entries = OrderedDict()
+        self.departures = OrderedDict()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+        entry = self._load(key)
+        if entry is not None:
+            self.disk_hits += 1
+            self._remember(self.entries, key, entry)
+            return entry
+
+        self.misses += 1
+        return None
+
+    def put(self, key, departures, buses):
+        departures.flags.writeable = False
+        buses.flags.writeable = False
+        entry = (departures, buses)
+        self._remember(self.entries, key, entry)
+        if self.directory is not None:
+            # У каждого процесса свой временный файл, поэтому файл кэша появляется только целиком
+            descriptor, temporary = tempfile.mkstemp(suffix=".tmp.npz", dir=self.directory)
+            try:
+                with os.fdopen(descriptor, "wb") as file:
+                    np.savez(file, departures=departures, buses=buses)
+                os.replace(temporary, self._path(key))
+            except BaseException:
+                with contextlib.suppress(OSError):
+                    os.remove(temporary)
+                raise
+        return entry
+
+    def get_departures(self, key):
+        """Отправления по ключу timetable_key(...)[:5] или None."""
+        departures = self.departures.get(key)
+        if departures is not None:
+            self.departures.move_to_end(key)
+        return departures
+
+    def put_departures(self, key, departures):
+        departures.flags.writeable = False
+        self._remember(self.departures, key, departures)
+        return departures
+
+    def clear(self):
+        self.entries.clear()
+        self.departures.clear()
+
+    def _remember(self, entries, key, entry):
+        entries[key] = entry
+        entries.move_to_end(key)
+        while len(entries) > self.maxsize:
+            entries.popitem(last=False)
+
+    def _path(self, key):
+        name = hashlib.sha1(repr(key).encode()).hexdigest()
+        return os.path.join(self.directory, f"{name}.npz")
+
+    def _load(self, key):
+        if self.directory is None:
+            return None
+        try:
+            with np.load(self._path(key)) as data:
+                departures, buses = data["departures"], data["buses"]
+        except (OSError, KeyError, ValueError, EOFError, zipfile.BadZipFile):
+            return None  # Нет файла или он поврежден - расписание строится заново
+        departures.flags.writeable = False
+        buses.flags.writeable = False
+        return departures, buses
+
+
+_cache = TimetableCache()
+
+
+def configure_cache(maxsize=256, directory=None):
+    """
+    Задает размер кэша расписаний и каталог для хранения на диске (None - только в памяти).
+    maxsize=0 отключает кэш в памяти.
+    """
+    global _cache
+    _cache = TimetableCache(maxsize, directory)
+    return _cache
+
+
+def clear_cache():
+    """Очищает кэш расписаний в памяти (файлы на диске остаются)."""
+    _cache.clear()
+
+
+def bus_timetable(start_time, end_time, peak_intervals, off_peak_intervals, peak_hours, num_buses, road_time):
+    """
+    Строит расписание на день в целых минутах. Повторные вызовы с теми же параметрами
+    берут расписание из кэша (см. configure_cache).
+
+    :return: Пара массивов (отправления, номера автобусов), -1 - рейс без автобуса
+    """
+    key = timetable_key(start_time, end_time, peak_intervals, off_peak_intervals, peak_hours, num_buses, road_time)
+    entry = _cache.get(key)
+    if entry is not None:
+        return entry
+
+    start, end, peak_intervals, off_peak_intervals, _, num_buses, road_time = key
+    departures = _cache.get_departures(key[:5])
+    if departures is None:
+        departures = _cache.put_departures(
+            key[:5], departure_minutes(start, end, peak_intervals, off_peak_intervals, peak_hours))
+    return _cache.put(key, departures, assign_buses(departures, num_buses, road_time))
+
+
+def warn_dropped(buses, num_buses):
+    """
+    Предупреждает, если часть отправлений осталась без автобуса.
+    Сколько автобусов нужно на самом деле, считает scheduler.fleet.
+    """
+    dropped = int((buses < 0).sum())
+    if dropped:
+        logger.warning("Не хватает автобусов: пропущено %d из %d отправлений при %d автобусах",
+                       dropped, len(buses), num_buses)
+    return dropped
+
+
+def group_by_bus(departures, buses, num_buses):
+    """
+    Раскладывает отправления по автобусам: список массивов минут для каждого автобуса.
+    """
+    if num_buses <= 0:
+        return []
+    order = np.argsort(buses, kind="stable")
+    counts = np.bincount(buses[buses >= 0], minlength=num_buses)
+    served = order[len(buses) - counts.sum():]
+    return np.split(departures[served], np.cumsum(counts)[:-1])
+
+
+def is_weekend(day):
+    """Суббота и воскресенье; день считается от понедельника и может быть больше 6."""
+    return day % 7 in (5, 6)
+
+
+def day_timetable(day, start_time, end_time, peak_intervals, off_peak_intervals, peak_hours, num_buses, road_time):
+    """
+    Расписание дня в целых минутах (см. bus_timetable). В выходные часов пик нет.
+    """
+    weekend = is_weekend(day)
+    return bus_timetable(
+        start_time,
+        end_time,
+        off_peak_intervals if weekend else peak_intervals,
+        off_peak_intervals,
+        [] if weekend else peak_hours,
+        num_buses,
+        road_time
+    )
+
+
+def create_day_bus_schedule(day, start_time, end_time, peak_intervals, off_peak_intervals, peak_hours, num_buses,
+                            road_time):
+    """
+    Создает расписание автобусов на один день: в выходные движение без часов пик.
+
+    :param day: Номер дня от понедельника (день недели - day % 7)
+    :return: Список расписаний для каждого автобуса
+    """
+    departures, buses = day_timetable(day, start_time, end_time, peak_intervals, off_peak_intervals, peak_hours,
+                                      num_buses, road_time)
+    warn_dropped(buses, num_buses)
+    return [[from_minutes(minute) for minute in bus_departures.tolist()]
+            for bus_departures in group_by_bus(departures, buses, num_buses)]
+
+
+def day_trips(departures, buses, road_time):
+    """
+    Рейсы дня (отправление, прибытие, автобус) из массивов bus_timetable в порядке отправления,
+    без рейсов, которым не хватило автобуса.
+    """
+    served = buses >= 0
+    return [[from_minutes(departure), from_minutes(departure + road_time), bus]
+            for departure, bus in zip(departures[served].tolist(), buses[served].tolist())]
+
+
+def create_weekly_bus_schedule(start_time, end_time, peak_intervals, off_peak_intervals, peak_hours, num_buses,
+                               road_time):
+    """
+    Создает расписание автобусов на неделю с учетом времени работы, интервалов и часов пик.
+
+    :param start_time: Время начала работы (в формате "HH:MM")
+    :param end_time: Время окончания работы (в формате "HH:MM")
+    :param peak_intervals: Интервал движения в час пик (в минутах)
+    :param off_peak_intervals: Интервал движения в остальное время (в минутах)
+    :param peak_hours: Список часов пик (например, [(7, 9), (17, 19)])
+    :param num_buses: Количество автобусов
+    :param road_time: Время в пути для каждого автобуса (в минутах)
+    :return: Словарь с расписанием для каждого дня недели
+    """
+    weekly_schedule = {}
+
+    for day in range(7):  # 0 - понедельник, 6 - воскресенье
+        weekly_schedule[day] = create_day_bus_schedule(day, start_time, end_time, peak_intervals, off_peak_intervals,
+                                                       peak_hours, num_buses, road_time)
+
+    return weekly_schedule
+
+
+def create_bus_schedule(start_time, end_time, peak_intervals, off_peak_intervals, peak_hours, num_buses, road_time,
+                        departures=None):
+    """
+    Создает расписание автобусов с учетом времени работы, интервалов и часов пик.
+
+    :param start_time: Время начала работы (в формате "HH:MM")
+    :param end_time: Время окончания работы (в формате "HH:MM")
+    :param peak_intervals: Интервал движения в час пик (в минутах)
+    :param off_peak_intervals: Интервал движения в остальное время (в минутах)
+    :param peak_hours: Список часов пик (например, [(7, 9), (17, 19)])
+    :param num_buses: Количество автобусов
+    :param road_time: Время в пути для каждого автобуса (в минутах)
+    :param departures: Готовые отправления в минутах от полуночи (например, из scheduler.demand);
+                       если заданы, время работы, интервалы и часы пик не используются
+    :return: Список расписаний для каждого автобуса
+    """
+    if departures is None:
+        departures, buses = bus_timetable(start_time, end_time, peak_intervals, off_peak_intervals, peak_hours,
+                                          num_buses, road_time)
+    else:
+        departures = np.sort(np.asarray(departures, dtype=np.int64))
+        buses = assign_buses(departures, num_buses, road_time)
+    warn_dropped(buses, num_buses)
+
+    # Переводим минуты обратно в объекты времени
+    bus_schedules = [[from_minutes(minute) for minute in bus_departures.tolist()]
+                     for bus_departures in group_by_bus(departures, buses, num_buses)]
+
+    return bus_schedules
+
+
+def weekly_trips(weekly_schedule, road_time):
+    """
+    Собирает рейсы каждого дня (отправление, прибытие, автобус), отсортированные по времени отправления.
+
+    :return: Список пар (день, рейсы) для assign_drivers_to_schedule
+    """
+    days = []
+    for day, schedule in weekly_schedule.items():
+        time_bus = []
+        for i, bus_schedule in enumerate(schedule):
+            for departure in bus_schedule:
+                time_bus.append(
+                    [departure, departure + timedelta(minutes=road_time), i])
+        days.append((day, sorted(time_bus, key=lambda x: x[0])))
+    return days
@@ -0,0 +1,143 @@
+"""
+Проверка готового распределения водителей по правилам труда из DRIVER_TYPES.
+
+Назначения загружаются в столбцы numpy (водитель, день, начало, конец), все правила
+проверяются векторно после одной сортировки, поэтому миллион назначений проверяется за секунды.
+"""
+import numpy as np
+
+from .drivers import DRIVER_TYPES
+
+TYPES = tuple(DRIVER_TYPES)  # Код типа водителя - номер в этом кортеже
+BREAK_AFTER = 4 * 60  # Перерыв обязателен, если смена длиннее (в минутах)
+
+# Правила, которые проверяет Driver.can_take_route: их нарушение - ошибка распределения
+HARD_RULES = ("overlap", "daily_max", "type_a_window", "type_a_weekend", "type_b_rest")
+# Правила, которые жадный алгоритм не соблюдает: недоработка дневной нормы и перерыв
+SOFT_RULES = ("daily_min", "break")
+RULES = HARD_RULES + SOFT_RULES
+
+
+def columns_from_drivers(drivers):
+    """
+    Собирает маршруты водителей в столбцы.
+
+    :param drivers: Список водителей Driver
+    :return: Словарь массивов "driver" (номер в drivers), "type" (код в TYPES), "day", "start", "end"
+             и список подписей водителей (тип, номер)
+    """
+    counts = np.array([len(driver.route_days) for driver in drivers], dtype=np.int64)
+    type_codes = np.array([TYPES.index(driver.type) for driver in drivers], dtype=np.int8)
+
+    def column(name, dtype):
+        arrays = [np.frombuffer(getattr(driver, name), dtype=dtype) for driver in drivers if len(driver.route_days)]
+        return np.concatenate(arrays).astype(np.int64) if arrays else np.empty(0, dtype=np.int64)
+
+    columns = {
+        "driver": np.repeat(np.arange(len(drivers), dtype=np.int64), counts),
+        "type": np.repeat(type_codes, counts),
+        "day": column("route_days", np.int32),
+        "start": column("route_starts", np.int64),
+        "end": column("route_ends", np.int64),
+    }
+    return columns, [(driver.type, driver.id) for driver in drivers]
+
+
+def find_violations(columns):
+    """
+    Находит нарушения правил.
+
+    :param columns: Столбцы назначений (см. columns_from_drivers), время - в минутах от полуночи дня
+    :return: Словарь массивов "driver", "day", "rule" (номер в RULES), "value" (время рейса,
+             длина смены или наибольший промежуток - зависит от правила)
+    """
+    if not len(columns["driver"]):
+        empty = np.empty(0, dtype=np.int64)
+        return {"driver": empty, "day": empty, "rule": empty, "value": empty}
+
+    order = np.lexsort((columns["start"], columns["day"], columns["driver"]))
+    driver = columns["driver"][order]
+    type_code = columns["type"][order].astype(np.int64)
+    day = columns["day"][order]
+    start = columns["start"][order]
+    end = columns["end"][order]
+
+    work_min = np.array([DRIVER_TYPES[name]["work_min"] for name in TYPES])
+    work_max = np.array([DRIVER_TYPES[name]["work_max"] for name in TYPES])
+    break_duration = np.array([DRIVER_TYPES[name]["break_duration"] for name in TYPES])
+    is_a = type_code == TYPES.index("A")
+
+    found = []
+
+    def add(rule, mask, drivers, days, values):
+        found.append((np.full(int(mask.sum()), RULES.index(rule)), drivers[mask], days[mask], values[mask]))
+
+    # Рейсы одного водителя в один день, идущие подряд
+    same_day = (driver[1:] == driver[:-1]) & (day[1:] == day[:-1])
+    # Рейс пересекается с любым более ранним рейсом смены, если начинается не позже наибольшего из их окончаний.
+    # Наибольшее окончание считается одним np.maximum.accumulate: смены сдвинуты так, чтобы не влиять друг на друга
+    shift_number = np.r_[0, np.cumsum(~same_day)]
+    shift_offset = shift_number * (int(end.max()) - int(end.min()) + 1)
+    latest_end = np.maximum.accumulate(end + shift_offset) - shift_offset
+    add("overlap", np.r_[False, same_day & (start[1:] <= latest_end[:-1])], driver, day, start)
+    add("type_a_window", is_a & ((end // 60 % 24 > 18) | (end // 60 % 24 < 1)), driver, day, end)
+
+    # Рабочие дни водителей (водитель, день)
+    first = np.flatnonzero(np.r_[True, ~same_day])
+    shift_driver = driver[first]
+    shift_type = type_code[first]
+    shift_day = day[first]
+    shift_start = start[first]
+    shift_end = np.maximum.reduceat(end, first)
+    span = shift_end - shift_start  # Отработанные минуты, как в Driver.assign_route
+    gaps = np.r_[0, np.where(same_day, start[1:] - end[:-1], 0)]
+    longest_gap = np.maximum.reduceat(gaps, first)
+    shift_a = shift_type == TYPES.index("A")
+
+    add("daily_max", span > work_max[shift_type], shift_driver, shift_day, span)
+    add("daily_min", span < work_min[shift_type], shift_driver, shift_day, span)
+    add("type_a_window", shift_a & ((shift_start // 60 % 24 < 6) | (shift_start // 60 % 24 >= 8)),
+        shift_driver, shift_day, shift_start)
+    add("type_a_weekend", shift_a & (shift_day % 7 >= 5), shift_driver, shift_day, shift_start)
+    add("break", (break_duration[shift_type] > 0) & (span > BREAK_AFTER) & (longest_gap < break_duration[shift_type]),
+        shift_driver, shift_day, longest_gap)
+
+    # Тип B не работает два дня подряд
+    next_day = np.r_[(shift_driver[1:] == shift_driver[:-1]) & (shift_day[1:] == shift_day[:-1] + 1), False]
+    add("type_b_rest", next_day & (shift_type == TYPES.index("B")), shift_driver, shift_day + 1, shift_day + 1)
+
+    rules, drivers, days, values = (np.concatenate(parts) for parts in zip(*found))
+    order = np.lexsort((rules, days, drivers))
+    return {"driver": drivers[order], "day": days[order], "rule": rules[order], "value": values[order]}
+
+
+def driver_reports(violations, labels):
+    """
+    Группирует нарушения по водителям.
+
+    :param labels: Подписи водителей (тип, номер) по номерам из столбца "driver"
+    :return: Словарь: подпись водителя -> список (правило, день, значение)
+    """
+    reports = {}
+    for driver, day, rule, value in zip(violations["driver"].tolist(), violations["day"].tolist(),
+                                        violations["rule"].tolist(), violations["value"].tolist()):
+        reports.setdefault(labels[driver], []).append((RULES[rule], day, value))
+    return reports
+
+
+def summary(violations):
+    """Количество нарушений по каждому правилу."""
+    counts = np.bincount(violations["rule"], minlength=len(RULES))
+    return dict(zip(RULES, counts.tolist()))
+
+
+def validate(drivers):
+    """
+    Проверяет распределение водителей.
+
+    :param drivers: Список водителей Driver
+    :return: Пара: количество нарушений по правилам и отчеты по водителям (см. driver_reports)
+    """
+    columns, labels = columns_from_drivers(drivers)
+    violations = find_violations(columns)
+    return summary(violations), driver_reports(violations, labels)
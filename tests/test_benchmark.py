@@ -0,0 +1,35 @@
+"""
+Проверки замеров производительности: сценарии воспроизводимы, повторные прогоны дают те же
+показатели качества, что и прямой вызов планировщика.
+"""
+from scheduler.benchmark import make_scenarios, run_benchmark, run_scenario
+from scheduler.drivers import assign_drivers_to_schedule
+from scheduler.timetable import create_weekly_bus_schedule, weekly_trips
+
+QUALITY = ("drivers_used", "drivers_a", "drivers_b", "departures_planned", "departures_dropped")
+
+
+def test_scenarios_depend_only_on_seed():
+    grid = {"lines": [1, 3], "fleet_sizes": [4, 8], "headways": [(10, 20)], "horizons": [7]}
+    scenarios = make_scenarios(seed=5, **grid)
+    assert scenarios == make_scenarios(seed=5, **grid)
+    assert len({scenario["name"] for scenario in scenarios}) == len(scenarios) == 4
+
+
+def test_run_scenario_matches_direct_assignment():
+    scenario = make_scenarios(lines=[1], fleet_sizes=[4], headways=[(5, 15)], horizons=[7], seed=2)[0]
+    route = scenario["routes"][0]
+    drivers = assign_drivers_to_schedule(weekly_trips(create_weekly_bus_schedule(**route), route["road_time"]))
+
+    first = run_scenario(scenario)
+    second = run_scenario(scenario)
+    assert {name: first[name] for name in QUALITY} == {name: second[name] for name in QUALITY}
+    assert first["drivers_used"] == len(drivers) == first["drivers_a"] + first["drivers_b"]
+    assert first["departures_planned"] > first["departures_dropped"] > 0
+
+
+def test_report_has_one_entry_per_scenario():
+    scenarios = make_scenarios(lines=[1, 2], fleet_sizes=[8], headways=[(10, 20)], horizons=[1])
+    report = run_benchmark(scenarios, repeat=2, memory=False)
+    assert [entry["name"] for entry in report["scenarios"]] == [scenario["name"] for scenario in scenarios]
+    assert all(entry["total_s"] >= 0 for entry in report["scenarios"])
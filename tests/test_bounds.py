@@ -0,0 +1,57 @@
+"""
+Проверки нижних оценок: покрытие цепочками совпадает с точным паросочетанием при одинаковом
+времени в пути, а оценки не превышают результат жадного распределения.
+"""
+import random
+
+import numpy as np
+import pytest
+
+from scheduler.bounds import chain_cover, max_overlap, schedule_bounds
+from scheduler.cli import DEFAULTS
+from scheduler.drivers import assign_drivers_to_schedule
+from scheduler.timetable import create_weekly_bus_schedule, weekly_trips
+
+
+def exact_chain_cover(departures, arrivals, max_shift):
+    """Рейсы минус наибольшее паросочетание "предыдущий - следующий" (алгоритм Куна)."""
+    count = len(departures)
+    following = [[j for j in range(count) if departures[j] > arrivals[i] and arrivals[j] - departures[i] <= max_shift]
+                 for i in range(count)]
+    previous = [-1] * count
+
+    def augment(i, seen):
+        for j in following[i]:
+            if j not in seen:
+                seen.add(j)
+                if previous[j] < 0 or augment(previous[j], seen):
+                    previous[j] = i
+                    return True
+        return False
+
+    return count - sum(augment(i, set()) for i in range(count))
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_chain_cover_is_exact_for_equal_trip_times(seed):
+    rng = random.Random(seed)
+    duration = rng.randint(10, 90)
+    departures = np.array(sorted(rng.randint(0, 600) for _ in range(rng.randint(1, 25))), dtype=np.int64)
+    arrivals = departures + duration
+    max_shift = rng.randint(duration, 400)
+    assert chain_cover(departures, arrivals, max_shift) == exact_chain_cover(departures, arrivals, max_shift)
+
+
+def test_max_overlap_counts_touching_trips():
+    departures = np.array([0, 10, 20], dtype=np.int64)
+    assert max_overlap(departures, departures + 10) == 2
+    assert max_overlap(departures, departures + 9) == 1
+
+
+@pytest.mark.parametrize("num_buses, road_time", [(8, 60), (4, 45), (12, 90)])
+def test_bounds_do_not_exceed_greedy_result(num_buses, road_time):
+    params = {**DEFAULTS, "num_buses": num_buses, "road_time": road_time}
+    days = weekly_trips(create_weekly_bus_schedule(**params), road_time)
+    bounds = schedule_bounds(days)
+    assert 0 < bounds["drivers"] <= len(assign_drivers_to_schedule(days))
+    assert 0 < bounds["buses"] <= len({trip[2] for _, trips in days for trip in trips})
@@ -0,0 +1,54 @@
+"""
+Проверки кэша расписаний: повторные и равные по смыслу параметры не строят расписание заново,
+давно не использованные расписания вытесняются, поврежденный файл на диске - промах.
+"""
+import pytest
+
+from scheduler import timetable
+from scheduler.cli import DEFAULTS
+
+
+@pytest.fixture(autouse=True)
+def restore_cache():
+    yield
+    timetable.configure_cache()
+
+
+def test_equivalent_parameters_share_an_entry():
+    cache = timetable.configure_cache()
+    first = timetable.bus_timetable(**DEFAULTS)
+    # Часы пик при равных интервалах ничего не меняют
+    timetable.bus_timetable(**{**DEFAULTS, "peak_intervals": 15, "off_peak_intervals": 15})
+    timetable.bus_timetable(**{**DEFAULTS, "peak_intervals": 15, "off_peak_intervals": 15, "peak_hours": []})
+    second = timetable.bus_timetable(**DEFAULTS)
+
+    assert second[0] is first[0]
+    assert (cache.hits, cache.misses) == (2, 2)
+    with pytest.raises(ValueError):
+        first[0][0] = 0
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = timetable.configure_cache(maxsize=2)
+    for num_buses in (1, 2, 1, 3):
+        timetable.bus_timetable(**{**DEFAULTS, "num_buses": num_buses})
+    assert [key[5] for key in cache.entries] == [1, 3]
+
+
+def test_disk_store_survives_restart_and_ignores_corrupt_files(tmp_path):
+    timetable.configure_cache(directory=tmp_path)
+    departures, buses = timetable.bus_timetable(**DEFAULTS)
+    files = list(tmp_path.iterdir())
+    assert [path.suffix for path in files] == [".npz"]
+
+    cache = timetable.configure_cache(directory=tmp_path)
+    loaded = timetable.bus_timetable(**DEFAULTS)
+    assert cache.disk_hits == 1
+    assert (loaded[0] == departures).all() and (loaded[1] == buses).all()
+
+    with open(files[0], "r+b") as file:
+        file.truncate(64)
+    cache = timetable.configure_cache(directory=tmp_path)
+    rebuilt = timetable.bus_timetable(**DEFAULTS)
+    assert (cache.disk_hits, cache.misses) == (0, 1)
+    assert (rebuilt[0] == departures).all() and (rebuilt[1] == buses).all()
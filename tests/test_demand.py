@@ -0,0 +1,80 @@
+"""
+Проверки отправлений по спросу: интервалы ограничены min_headway и max_headway, все ряды
+сразу дают то же, что каждый ряд отдельно, а CSV со спросом читается в массив (маршруты, дни, слоты).
+"""
+import numpy as np
+import pytest
+
+from scheduler.cli import main
+from scheduler.demand import (CAPACITY, LOAD_FACTOR, MAX_HEADWAY, MIN_HEADWAY, SLOT_MINUTES, day_departures,
+                              demand_departures, headways, load_demand)
+from scheduler.timetable import service_window
+
+START_TIME, END_TIME = "06:00", "01:00"
+
+
+@pytest.fixture
+def demand():
+    rng = np.random.default_rng(0)
+    start, end = service_window(START_TIME, END_TIME)
+    return rng.gamma(1.0, 120.0, size=(3, 4, -(-(end - start) // SLOT_MINUTES)))
+
+
+def test_headways_are_clipped():
+    result = headways([0, CAPACITY * LOAD_FACTOR * SLOT_MINUTES / 10, 10 ** 6])
+    assert result.tolist() == [MAX_HEADWAY, 10, MIN_HEADWAY]
+
+
+def test_departures_stay_within_service_and_headway_limits(demand):
+    start, end = service_window(START_TIME, END_TIME)
+    departures, offsets = demand_departures(demand, start, end)
+    assert len(offsets) == 3 * 4 + 1
+    for first, last in zip(offsets[:-1], offsets[1:]):
+        row = departures[first:last]
+        assert row[0] == start and row[-1] < end
+        gaps = np.diff(row)
+        assert gaps.min() >= MIN_HEADWAY and gaps.max() <= MAX_HEADWAY
+
+
+def test_rows_match_single_day_computation(demand):
+    start, end = service_window(START_TIME, END_TIME)
+    departures, offsets = demand_departures(demand, start, end)
+    rows = demand.reshape(-1, demand.shape[-1])
+    for index, row in enumerate(rows):
+        expected = day_departures(row, START_TIME, END_TIME)
+        assert departures[offsets[index]:offsets[index + 1]].tolist() == expected.tolist()
+
+
+def test_without_demand_buses_run_every_max_headway():
+    departures = day_departures(np.zeros(8), "06:00", "08:00")
+    assert departures.tolist() == list(range(6 * 60, 8 * 60, MAX_HEADWAY))
+
+
+def write_csv(path, rows):
+    path.write_text("line,day,time,passengers\n" + "".join(f"{row}\n" for row in rows), encoding="utf-8")
+    return path
+
+
+def test_load_demand(tmp_path):
+    path = write_csv(tmp_path / "demand.csv", ["12,0,06:00,40", "12,0,06:10,20", "7,1,00:30,15", "12,1,07:45,5"])
+    names, demand = load_demand(path, START_TIME, END_TIME)
+    assert names == ["12", "7"]
+    assert demand.shape == (2, 2, 19 * 60 // SLOT_MINUTES)
+    assert demand[0, 0, 0] == 60  # 06:00 и 06:10 - один слот
+    assert demand[1, 1, (24 * 60 + 30 - 6 * 60) // SLOT_MINUTES] == 15  # После полуночи - тот же день обслуживания
+    assert demand[0, 1, 7] == 5
+    assert demand.sum() == 80
+
+
+def test_demand_outside_service_is_rejected(tmp_path):
+    path = write_csv(tmp_path / "demand.csv", ["12,0,02:00,40"])
+    with pytest.raises(ValueError):
+        load_demand(path, START_TIME, END_TIME)
+
+
+def test_unknown_line_is_a_usage_error(tmp_path, capsys):
+    path = write_csv(tmp_path / "demand.csv", ["12,0,06:00,40"])
+    with pytest.raises(SystemExit) as error:
+        main(["--demand", str(path), "--line", "99", "--no-render"])
+    assert error.value.code == 2
+    assert "99" in capsys.readouterr().err
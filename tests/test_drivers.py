@@ -0,0 +1,51 @@
+"""
+Проверки водителя со столбцами маршрутов: прежнее представление маршрутов, отработанные минуты
+и пересчет после вставки и удаления маршрутов.
+"""
+from scheduler.drivers import Driver
+from scheduler.timetable import from_minutes
+
+
+def make_driver(driver_type, routes):
+    driver = Driver(1, driver_type)
+    for day, bus_id, start, end in routes:
+        driver.assign_route(day, bus_id, from_minutes(start), from_minutes(end))
+    return driver
+
+
+def test_routes_view_matches_tuples():
+    routes = [(0, 1, 6 * 60, 7 * 60), (0, 2, 8 * 60, 9 * 60), (3, 1, 23 * 60 + 30, 24 * 60 + 30)]
+    driver = make_driver("B", routes)
+    expected = [(day, bus_id, from_minutes(start), from_minutes(end)) for day, bus_id, start, end in routes]
+
+    assert driver.routes == expected
+    assert driver.routes[1:] == expected[1:]
+    assert driver.routes[-1] == expected[-1]
+    assert len(driver.routes) == 3
+
+
+def test_minutes_are_counted_from_the_end_of_the_previous_route():
+    driver = make_driver("A", [(0, 1, 6 * 60, 7 * 60), (0, 1, 7 * 60 + 30, 8 * 60 + 30), (1, 1, 7 * 60, 8 * 60)])
+    assert driver.daily_minutes_worked == {0: 150, 1: 60}
+    assert driver.daily_minutes(0) == 150
+    assert driver.daily_minutes(2) == 0
+    assert driver.total_minutes_worked == 210
+
+
+def test_insert_and_remove_recount_minutes():
+    driver = make_driver("A", [(0, 1, 6 * 60, 7 * 60), (0, 1, 9 * 60, 10 * 60)])
+    driver.insert_route(0, 2, from_minutes(7 * 60 + 30), from_minutes(8 * 60 + 30))
+    assert [route[2] for route in driver.routes] == [from_minutes(minute) for minute in (360, 450, 540)]
+    assert driver.daily_minutes(0) == 240
+
+    removed = driver.remove_routes(lambda route: route[1] == 2)
+    assert removed == [(0, 2, from_minutes(450), from_minutes(510))]
+    assert driver.daily_minutes(0) == 240  # Смена по-прежнему 06:00-10:00
+    assert driver.total_minutes_worked == driver.daily_minutes(0)
+
+
+def test_forget_before_keeps_worked_minutes():
+    driver = make_driver("B", [(0, 1, 360, 420), (2, 1, 360, 420), (4, 1, 360, 420)])
+    driver.forget_before(3)
+    assert [route[0] for route in driver.routes] == [4]
+    assert driver.total_minutes_worked == 180
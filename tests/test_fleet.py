@@ -0,0 +1,31 @@
+"""
+Проверки размера парка: минимальный парк выполняет все отправления, на автобус меньше - уже нет.
+"""
+import numpy as np
+import pytest
+
+from scheduler.bounds import max_overlap
+from scheduler.cli import DEFAULTS
+from scheduler.fleet import day_fleet, weekly_fleet
+from scheduler.timetable import assign_buses
+
+
+@pytest.mark.parametrize("day", [0, 5])
+@pytest.mark.parametrize("road_time", [45, 60, 120])
+def test_min_fleet_is_exact(day, road_time):
+    params = {**DEFAULTS, "road_time": road_time}
+    result = day_fleet(day, **params)
+    departures = np.array(sorted(minute for block in result["blocks"] for minute in block), dtype=np.int64)
+
+    assert len(departures) == result["planned"]
+    assert result["min_fleet"] == max_overlap(departures, departures + road_time)
+    assert (assign_buses(departures, result["min_fleet"], road_time) >= 0).all()
+    assert (assign_buses(departures, result["min_fleet"] - 1, road_time) < 0).any()
+
+
+def test_dropped_departures_are_counted_for_the_given_fleet():
+    small = weekly_fleet(**{**DEFAULTS, "num_buses": 3})
+    enough = weekly_fleet(**{**DEFAULTS, "num_buses": small["min_fleet"]})
+    assert small["dropped"] > 0
+    assert enough["dropped"] == 0
+    assert enough["min_fleet"] == small["min_fleet"]
@@ -0,0 +1,90 @@
+"""
+Проверки генетического алгоритма: хромосома без потерь переводится в водителей и обратно,
+результат воспроизводим при любом числе процессов, не хуже исходного и без нарушений правил.
+"""
+import pytest
+
+from scheduler.cli import DEFAULTS
+from scheduler.drivers import assign_drivers_to_schedule
+from scheduler.genetic import (PENALTY_DRIVER, START_HOUR, TRIP_MINUTES, ShiftSimulator, drivers_from_genes, evolve,
+                               fitness, generate_schedule, is_type_a_available, trips_from_drivers)
+from scheduler.timetable import create_day_bus_schedule, create_weekly_bus_schedule, weekly_trips
+from scheduler.validate import HARD_RULES, validate
+
+
+@pytest.fixture(scope="module")
+def problem():
+    drivers = assign_drivers_to_schedule(weekly_trips(create_weekly_bus_schedule(**DEFAULTS), DEFAULTS["road_time"]))
+    return drivers, trips_from_drivers(drivers)
+
+
+def routes(drivers):
+    return sorted(route for driver in drivers for route in driver.routes)
+
+
+def test_genes_round_trip(problem):
+    drivers, (trips, driver_types, genes) = problem
+    assert routes(drivers_from_genes(trips, driver_types, genes)) == routes(drivers)
+
+
+def test_evolve_is_reproducible_and_feasible(problem):
+    drivers, (trips, driver_types, genes) = problem
+    serial = evolve(trips, driver_types, genes, population_size=12, generations=5, seed=3, workers=1)
+    parallel = evolve(trips, driver_types, genes, population_size=12, generations=5, seed=3, workers=2)
+    assert serial == parallel
+
+    best, score = serial
+    assert score == fitness(best, (trips, driver_types))
+    assert score <= fitness(genes, (trips, driver_types))
+
+    counts, _ = validate(drivers_from_genes(trips, driver_types, best))
+    assert all(counts[rule] == 0 for rule in HARD_RULES)
+
+
+def test_fitness_uses_the_weekday_beyond_the_first_week():
+    schedule = {day: create_day_bus_schedule(day, **DEFAULTS) for day in range(14)}
+    drivers = assign_drivers_to_schedule(weekly_trips(schedule, DEFAULTS["road_time"]))
+    trips, driver_types, genes = trips_from_drivers(drivers)
+    # Жадное распределение не нарушает правил и не перерабатывает, поэтому штраф - только за водителей
+    assert fitness(genes, (trips, driver_types)) == PENALTY_DRIVER * len(drivers)
+
+
+def departures_by(schedule, *fields):
+    """Отправления (в минутах от полуночи дня расписания) по дням и значениям полей записи."""
+    result = {}
+    for day, day_schedule in enumerate(schedule):
+        for entry in day_schedule:
+            hour = entry["hour"] + (24 if entry["hour"] < START_HOUR else 0)
+            key = (day,) + tuple(entry[field] for field in fields)
+            result.setdefault(key, []).append(hour * 60 + entry["minute"])
+    return result
+
+
+def test_simulator_respects_trip_time_and_driver_rules():
+    schedule = generate_schedule(days=14)
+    assert schedule == generate_schedule(days=14)
+
+    # Автобус и водитель берут следующий рейс только после прибытия
+    for fields in (("bus_id",), ("driver_type", "driver_id")):
+        for departures in departures_by(schedule, *fields).values():
+            assert all(later - earlier > TRIP_MINUTES for earlier, later in zip(departures, departures[1:]))
+
+    b_days = {}
+    for day, driver_type, driver_id in departures_by(schedule, "driver_type", "driver_id"):
+        if driver_type == "B":
+            b_days.setdefault(driver_id, []).append(day)
+    assert all(later - earlier >= 3 for days in b_days.values() for earlier, later in zip(days, days[1:]))
+
+    for (day, driver_type), departures in departures_by(schedule, "driver_type").items():
+        if driver_type == "A":
+            assert all(is_type_a_available(day + minute // (24 * 60), minute // 60 % 24) for minute in departures)
+
+
+def test_simulator_counts_departures_without_a_bus():
+    enough = ShiftSimulator()
+    generate_schedule(simulator=enough)
+    assert enough.dropped == 0
+
+    few = ShiftSimulator(num_buses=2)
+    generate_schedule(days=1, simulator=few)
+    assert few.dropped > 0
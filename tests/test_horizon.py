@@ -0,0 +1,47 @@
+"""
+Проверки планирования на длинный горизонт: день за днем с короткой историей водителей
+получается то же распределение, что при назначении всего горизонта сразу.
+"""
+import pytest
+
+from scheduler.cli import DEFAULTS
+from scheduler.drivers import DriverAssigner
+from scheduler.horizon import iter_rolling_schedule
+from scheduler.timetable import MINUTES_IN_DAY, create_day_bus_schedule, to_minutes, weekly_trips
+
+DAYS = 17
+
+
+def whole_horizon():
+    """Назначение всех дней одним DriverAssigner без удаления истории."""
+    schedule = {day: create_day_bus_schedule(day, **DEFAULTS) for day in range(DAYS)}
+    assigner = DriverAssigner()
+    result = []
+    for day, routes in weekly_trips(schedule, DEFAULTS["road_time"]):
+        assigned = assigner.assign_day(day, routes)
+        result.append([(to_minutes(departure), to_minutes(arrival), bus, (driver.type, driver.id))
+                       for (departure, arrival, bus), driver in zip(routes, assigned)])
+    return result
+
+
+def test_rolling_schedule_matches_whole_horizon():
+    assigner = DriverAssigner()
+    days = list(iter_rolling_schedule(**DEFAULTS, days=DAYS, history_days=2, assigner=assigner))
+
+    assert [day["trips"] for day in days] == whole_horizon()
+    assert [day["weekday"] for day in days] == [day % 7 for day in range(DAYS)]
+    # У водителей остались только маршруты последних дней
+    assert min(driver.route_days[0] for driver in assigner.drivers if len(driver.route_days)) >= DAYS - 2
+
+
+def test_trips_after_midnight_are_carried_to_the_next_day():
+    days = list(iter_rolling_schedule(**DEFAULTS, days=2))
+    night = [trip for trip in days[0]["trips"] if trip[0] >= MINUTES_IN_DAY]
+    assert night
+    assert days[1]["carried"] == [(start - MINUTES_IN_DAY, end - MINUTES_IN_DAY, bus, driver)
+                                  for start, end, bus, driver in night]
+
+
+def test_short_history_is_rejected():
+    with pytest.raises(ValueError):
+        next(iter_rolling_schedule(**DEFAULTS, days=1, history_days=1))
@@ -0,0 +1,42 @@
+"""
+Проверки локального поиска: все рейсы остаются назначенными, нарушений правил не становится больше,
+водителей не больше, чем у жадного алгоритма, а исходные водители не изменяются.
+"""
+import pytest
+
+from scheduler.cli import DEFAULTS
+from scheduler.drivers import assign_drivers_to_schedule
+from scheduler.improve import improve_drivers
+from scheduler.timetable import create_day_bus_schedule, weekly_trips
+from scheduler.validate import HARD_RULES, validate
+
+
+def routes(drivers):
+    return sorted(route for driver in drivers for route in driver.routes)
+
+
+@pytest.mark.parametrize("params", [{}, {"num_buses": 5, "road_time": 45}, {"peak_intervals": 6, "num_buses": 12}])
+def test_improvement_keeps_trips_and_rules(params):
+    params = {**DEFAULTS, **params}
+    schedule = {day: create_day_bus_schedule(day, **params) for day in range(14)}
+    greedy = assign_drivers_to_schedule(weekly_trips(schedule, params["road_time"]))
+    before = routes(greedy)
+
+    improved = improve_drivers(greedy, time_budget=0.5)
+
+    assert routes(greedy) == before
+    assert routes(improved) == before
+    assert len(improved) <= len(greedy)
+    # При малом парке жадный алгоритм сам превышает дневную норму на минуты: ходы не добавляют нарушений
+    counts, _ = validate(improved)
+    greedy_counts, _ = validate(greedy)
+    assert all(counts[rule] <= greedy_counts[rule] for rule in HARD_RULES)
+    for driver_type in ("A", "B"):
+        ids = [driver.id for driver in improved if driver.type == driver_type]
+        assert ids == list(range(1, len(ids) + 1))
+
+
+def test_default_week_loses_a_driver():
+    greedy = assign_drivers_to_schedule(weekly_trips({day: create_day_bus_schedule(day, **DEFAULTS)
+                                                      for day in range(7)}, DEFAULTS["road_time"]))
+    assert len(improve_drivers(greedy, time_budget=2.0)) < len(greedy)
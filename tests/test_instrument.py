@@ -0,0 +1,57 @@
+"""
+Проверки замеров: время и профиль этапа собираются по всем его запускам, счетчики правил
+совпадают с числом проверок водителей.
+"""
+import cProfile
+import pstats
+
+import pytest
+
+from scheduler import instrument
+from scheduler.cli import DEFAULTS, run
+
+
+@pytest.fixture
+def metrics():
+    yield
+    instrument.disable()
+
+
+def first_phase():
+    return sum(range(10))
+
+
+def second_phase():
+    return sum(range(20))
+
+
+def profiled_functions(profiler):
+    return {function for _, _, function in pstats.Stats(profiler).stats}
+
+
+def test_profile_covers_every_run_of_a_phase(metrics):
+    collected = instrument.enable(profilers={"render": cProfile.Profile})
+    with instrument.phase("render"):
+        first_phase()
+    with instrument.phase("render"):
+        second_phase()
+
+    assert collected.phase_runs["render"] == 2
+    assert {"first_phase", "second_phase"} <= profiled_functions(collected.profiles["render"])
+
+
+def test_rule_counters(metrics):
+    collected = instrument.enable(count_rules=True)
+    run(dict(DEFAULTS), render=False)
+    counters = collected.counters
+
+    rejected = sum(counters[f"can_take_route.rejected.{reason}"] for reason in instrument.REASONS)
+    assert counters["can_take_route.calls"] > rejected > 0
+    assert set(collected.phases) >= {"timetable", "assignment"}
+
+
+def test_disabled_instrumentation_collects_nothing():
+    assert instrument.active() is None
+    with instrument.phase("timetable"):
+        instrument.count("new_drivers.A")
+    assert instrument.disable() is None
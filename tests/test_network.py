@@ -0,0 +1,78 @@
+"""
+Проверки сети маршрутов: каждый рейс получает водителя, переходы между маршрутами выдерживают
+пересменку и перегон, правила типов водителей соблюдаются, а общий пул не больше отдельных.
+"""
+import numpy as np
+import pytest
+
+from scheduler.drivers import DRIVER_TYPES
+from scheduler.network import Line, deadhead_matrix, plan_network
+
+RELIEF = 10
+DEADHEAD = {"north": {"south": 40}}
+
+LINES = [
+    Line("12", "north"),
+    Line("7", "north", num_buses=5, road_time=45, peak_intervals=12),
+    Line("31", "south", num_buses=6, road_time=75, start_time="05:30", end_time="23:00"),
+]
+
+
+@pytest.fixture(scope="module")
+def network():
+    return plan_network(LINES, range(14), RELIEF, DEADHEAD, workers=1)
+
+
+def test_deadhead_matrix():
+    matrix = deadhead_matrix(["north", "south", "west"], DEADHEAD)
+    assert matrix.tolist() == [[0, 40, 30], [40, 0, 30], [30, 30, 0]]
+    assert deadhead_matrix(["north", "south"], 15).tolist() == [[0, 15], [15, 0]]
+
+
+def test_every_trip_has_a_driver(network):
+    records, labels = network
+    assert len(records) > 0
+    assert records["driver"].min() >= 0 and records["driver"].max() < len(labels)
+
+
+def test_transfers_and_driver_rules(network):
+    records, labels = network
+    depots = sorted({line.depot for line in LINES})
+    depot = [depots.index(line.depot) for line in LINES]
+    deadhead = deadhead_matrix(depots, DEADHEAD)
+
+    working_days = {}
+    order = np.lexsort((records["departure"], records["day"], records["driver"]))
+    shifts = {}
+    for record in records[order].tolist():
+        day, line, departure, arrival, _, driver = record
+        shifts.setdefault((driver, day), []).append((departure, arrival, line))
+
+    for (driver, day), trips in shifts.items():
+        driver_type = labels[driver][0]
+        working_days.setdefault(driver, []).append(day)
+        assert trips[-1][1] - trips[0][0] <= DRIVER_TYPES[driver_type]["work_max"]
+        for (_, previous_end, previous_line), (start, _, line) in zip(trips, trips[1:]):
+            delay = 0
+            if line != previous_line:
+                delay = RELIEF + int(deadhead[depot[previous_line], depot[line]])
+            assert start > previous_end + delay
+        if driver_type == "A":
+            assert day % 7 < 5 and 6 <= trips[0][0] // 60 % 24 < 8
+            assert all(1 <= end // 60 % 24 <= 18 for _, end, _ in trips)
+
+    for driver, days in working_days.items():
+        if labels[driver][0] == "B":
+            assert all(later - earlier >= 2 for earlier, later in zip(days, days[1:]))
+
+
+def test_shared_pool_is_not_larger_than_separate_pools(network):
+    _, labels = network
+    separate = sum(len(plan_network([line], range(14), RELIEF, DEADHEAD, workers=1)[1]) for line in LINES)
+    assert len(labels) <= separate
+
+
+def test_parallel_timetables_give_the_same_plan(network):
+    records, labels = plan_network(LINES, range(14), RELIEF, DEADHEAD, workers=2)
+    assert (records == network[0]).all()
+    assert labels == network[1]
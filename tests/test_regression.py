@@ -0,0 +1,41 @@
+"""
+Регрессионная проверка индексированного поиска водителей: распределение совпадает с перебором списка.
+Запуск: python -m pytest
+"""
+import random
+
+import pytest
+
+from scheduler.cli import DEFAULTS
+from scheduler.drivers import DriverAssigner
+from scheduler.timetable import create_day_bus_schedule, weekly_trips
+
+
+def random_params(rng):
+    return {
+        **DEFAULTS,
+        "start_time": f"{rng.randint(4, 7):02d}:{rng.choice([0, 15, 30]):02d}",
+        "end_time": f"{rng.choice([22, 23, 0, 1, 2, 3]):02d}:00",
+        "peak_intervals": rng.randint(4, 15),
+        "off_peak_intervals": rng.randint(10, 30),
+        "peak_hours": rng.choice([[(7, 9), (17, 19)], [(7, 10), (16, 19)], [(8, 9)], []]),
+        "num_buses": rng.randint(2, 14),
+        "road_time": rng.randint(20, 120),
+    }
+
+
+def assign(days, indexed):
+    assigner = DriverAssigner(indexed=indexed)
+    for day, routes in days:
+        assigner.assign_day(day, routes)
+    return [(driver.type, driver.id, list(driver.routes)) for driver in assigner.drivers]
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_indexed_assignment_matches_linear(seed):
+    rng = random.Random(seed)
+    params = random_params(rng)
+    schedule = {day: create_day_bus_schedule(day, **params) for day in range(14)}
+    days = weekly_trips(schedule, params["road_time"])
+    assert assign(days, indexed=True) == assign(days, indexed=False)
+
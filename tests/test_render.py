@@ -0,0 +1,30 @@
+"""
+Таблицы расписания и список водителей совпадают с выводом исходного basic.py.
+
+Файлы tests/fixtures/basic_*.txt - вывод исходного basic.py с параметрами из PARAMETER_SETS.
+"""
+import contextlib
+import io
+from pathlib import Path
+
+import pytest
+
+from scheduler.cli import DEFAULTS, run
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+PARAMETER_SETS = {
+    "default": {},
+    "dense": {"peak_intervals": 5, "off_peak_intervals": 15, "num_buses": 10, "road_time": 45},
+    "short_peak": {"peak_hours": [(8, 9)], "num_buses": 6, "road_time": 75, "end_time": "01:30"},
+}
+
+
+@pytest.mark.parametrize("name", sorted(PARAMETER_SETS))
+def test_tables_match_original_basic(name):
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        run({**DEFAULTS, **PARAMETER_SETS[name]})
+    # Последняя строка - нижние оценки, в исходном basic.py ее не было
+    printed = output.getvalue().splitlines(keepends=True)[:-1]
+    assert "".join(printed) == (FIXTURES / f"basic_{name}.txt").read_text(encoding="utf-8")
@@ -0,0 +1,63 @@
+"""
+Проверки точечного исправления распределения: после отмены, переноса рейса и болезни водителя
+все рейсы остаются назначенными ровно один раз и жесткие правила не нарушаются.
+"""
+from datetime import timedelta
+
+import pytest
+
+from scheduler.cli import DEFAULTS
+from scheduler.drivers import assign_drivers_to_schedule
+from scheduler.repair import repair_assignment
+from scheduler.timetable import create_weekly_bus_schedule, weekly_trips
+from scheduler.validate import HARD_RULES, validate
+
+TIMETABLE_PARAMS = ("start_time", "end_time", "peak_intervals", "off_peak_intervals", "peak_hours", "num_buses",
+                    "road_time")
+
+
+@pytest.fixture
+def drivers():
+    params = {name: DEFAULTS[name] for name in TIMETABLE_PARAMS}
+    return assign_drivers_to_schedule(weekly_trips(create_weekly_bus_schedule(**params), params["road_time"]))
+
+
+def trips(drivers):
+    return sorted(route for driver in drivers for route in driver.routes)
+
+
+def hard_violations(drivers):
+    counts, _ = validate(drivers)
+    return {rule: counts[rule] for rule in HARD_RULES if counts[rule]}
+
+
+def test_cancel_retime_and_sick_driver(drivers):
+    before = trips(drivers)
+    cancelled = before[10][:3]
+    retimed = before[20]
+    sick = drivers[0]
+    sick_day = sick.routes[0][0]
+    new_start = retimed[2] + timedelta(minutes=5)
+    new_end = retimed[3] + timedelta(minutes=5)
+
+    result = repair_assignment(drivers, cancelled=[cancelled], retimed=[(retimed[:3], new_start, new_end)],
+                               unavailable=[(sick, sick_day)])
+
+    expected = [trip for trip in before if trip[:3] not in (cancelled, retimed[:3])]
+    expected.append((retimed[0], retimed[1], new_start, new_end))
+    assert trips(drivers) == sorted(expected)
+    assert result["unknown"] == []
+    assert all(route[0] != sick_day for route in sick.routes)
+    assert hard_violations(drivers) == {}
+
+
+def test_unknown_trip_is_reported_and_not_added(drivers):
+    before = trips(drivers)
+    missing = (0, 99, before[0][2])
+
+    result = repair_assignment(drivers, cancelled=[missing],
+                               retimed=[(missing, before[0][2], before[0][3])])
+
+    assert result["unknown"] == [missing]
+    assert result["assigned"] == []
+    assert trips(drivers) == before
@@ -0,0 +1,63 @@
+"""
+Проверки разбора запросов сервиса планирования: некорректные параметры дают 400 еще до расчета.
+"""
+import asyncio
+import json
+
+import pytest
+
+from scheduler.service import SchedulingService, parse_request
+
+
+@pytest.mark.parametrize("payload", [
+    {"start_time": "99:99"},
+    {"end_time": "7"},
+    {"num_buses": 10 ** 9},
+    {"road_time": 0},
+    {"peak_intervals": 10 ** 6},
+    {"off_peak_intervals": "15"},
+    {"peak_hours": [[7]]},
+    {"generations": 10 ** 9},
+    {"seed": -1},
+    {"algorithm": "annealing"},
+    {"color": "red"},
+])
+def test_malformed_request_is_rejected(payload):
+    with pytest.raises(ValueError):
+        parse_request(payload)
+
+
+def test_defaults_are_accepted():
+    request = parse_request({"num_buses": 10})
+    assert request["params"]["num_buses"] == 10
+    assert request["algorithm"] == "basic"
+
+
+def test_malformed_time_returns_400():
+    service = SchedulingService(workers=1)
+    try:
+        status, payload = asyncio.run(service.dispatch("POST", "/schedule", json.dumps({"start_time": "99:99"})))
+    finally:
+        service.close()
+    assert status == 400
+    assert "error" in payload
+
+
+def test_identical_requests_share_one_computation():
+    async def scenario(service):
+        request = parse_request({"num_buses": 6})
+        equivalent = parse_request({"num_buses": 6, "peak_intervals": 10})
+        first, second = await asyncio.gather(service.schedule(request), service.schedule(equivalent))
+        cached = await service.schedule(request)
+        return first, second, cached
+
+    service = SchedulingService(workers=1)
+    try:
+        first, second, cached = asyncio.run(scenario(service))
+    finally:
+        service.close()
+    assert first[0] == second[0] == cached[0] == 200
+    assert first[1] == second[1] == cached[1]
+    assert first[1]["trips"] > 0 and first[1]["drivers_used"] == len(first[1]["drivers"])
+    assert service.coalesced == 1
+    assert len(service.results) == 1
@@ -0,0 +1,73 @@
+"""
+Проверки столбцового формата: записанное расписание читается обратно без потерь,
+выборки по дню, маршруту и водителю совпадают с маршрутами водителей.
+"""
+import numpy as np
+import pytest
+
+from scheduler.cli import DEFAULTS
+from scheduler.drivers import assign_drivers_to_schedule
+from scheduler.storage import ScheduleFile, write_schedule
+from scheduler.timetable import create_weekly_bus_schedule, weekly_trips
+
+LINES = [DEFAULTS, {**DEFAULTS, "num_buses": 5, "road_time": 45, "peak_intervals": 12}]
+
+
+@pytest.fixture(scope="module")
+def lines():
+    return [assign_drivers_to_schedule(weekly_trips(create_weekly_bus_schedule(**params), params["road_time"]))
+            for params in LINES]
+
+
+@pytest.fixture
+def schedule(tmp_path, lines):
+    path = tmp_path / "schedule.bin"
+    count = write_schedule(path, lines, ["12", "7"])
+    assert count == sum(len(driver.route_days) for drivers in lines for driver in drivers)
+    return ScheduleFile(path)
+
+
+def driver_trips(driver):
+    return list(zip(driver.route_days, driver.route_starts, driver.route_ends, driver.route_buses))
+
+
+def record_trips(records):
+    return list(zip(*(records[field].tolist() for field in ("day", "departure", "arrival", "bus"))))
+
+
+def test_drivers_round_trip(schedule, lines):
+    assert schedule.lines == ["12", "7"]
+    drivers = [(line, driver) for line, line_drivers in enumerate(lines) for driver in line_drivers]
+    assert schedule.drivers == [(line, driver.type, driver.id) for line, driver in drivers]
+    for index, (line, driver) in enumerate(drivers):
+        records = schedule.driver(index)
+        assert record_trips(records) == driver_trips(driver)
+        assert (records["line"] == line).all()
+
+
+def test_day_and_line_slices(schedule, lines):
+    assert list(schedule.days) == list(range(7))
+    for day in schedule.days:
+        records = schedule.day(day, line=1)
+        assert isinstance(records, np.memmap)
+        expected = sorted((departure, arrival, bus) for driver in lines[1]
+                          for trip_day, departure, arrival, bus in driver_trips(driver) if trip_day == day)
+        assert sorted(trip[1:] for trip in record_trips(records)) == expected
+        assert len(schedule.day(day)) == len(schedule.day(day, line=0)) + len(records)
+    assert len(schedule.day(7)) == 0
+    assert len(schedule.line(0)) + len(schedule.line(1)) == len(schedule)
+
+
+def test_empty_schedule(tmp_path):
+    path = tmp_path / "empty.bin"
+    assert write_schedule(path, [[]]) == 0
+    schedule = ScheduleFile(path)
+    assert len(schedule) == 0
+    assert list(schedule.days) == []
+
+
+def test_foreign_file_is_rejected(tmp_path):
+    path = tmp_path / "other.bin"
+    path.write_bytes(b"not a schedule")
+    with pytest.raises(ValueError):
+        ScheduleFile(path)
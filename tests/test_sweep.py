@@ -0,0 +1,52 @@
+"""
+Проверки перебора параметров: каждый вариант получает результат, равные по смыслу варианты
+считаются один раз, Парето-фронт совпадает с попарным сравнением.
+"""
+import json
+import random
+
+from scheduler import timetable
+from scheduler.cli import DEFAULTS
+from scheduler.sweep import dominates, evaluate, iter_sweep, make_grid, pareto_frontier
+
+
+def by_params(results):
+    return {json.dumps(result["params"], sort_keys=True): result for result in results}
+
+
+def test_grid_covers_all_combinations():
+    points = make_grid(num_buses=[4, 8], road_time=[45, 60, 90])
+    assert len(points) == 6
+    assert {(point["num_buses"], point["road_time"]) for point in points} == {(4, 45), (4, 60), (4, 90), (8, 45),
+                                                                             (8, 60), (8, 90)}
+    assert all(point["start_time"] == DEFAULTS["start_time"] for point in points)
+
+
+def test_sweep_returns_every_point_in_parallel_and_serially():
+    points = make_grid(num_buses=[4, 8, 12], road_time=[45, 60], peak_intervals=[10, 20])
+    # При равных интервалах часы пик не важны: этот вариант совпадает с последним
+    points.append({**points[-1], "peak_hours": [(8, 9)]})
+
+    serial = by_params(iter_sweep(points, workers=1))
+    parallel = by_params(iter_sweep(points, workers=2))
+
+    assert serial == parallel
+    assert len(serial) == len(points)
+    original, equivalent = (serial[json.dumps(point, sort_keys=True)] for point in points[-2:])
+    assert {**equivalent, "params": None} == {**original, "params": None} == {**evaluate(points[-1]), "params": None}
+
+
+def test_points_differing_in_fleet_share_departures():
+    timetable.configure_cache()
+    small, _ = timetable.bus_timetable(**{**DEFAULTS, "num_buses": 3})
+    large, _ = timetable.bus_timetable(**{**DEFAULTS, "num_buses": 30, "road_time": 45})
+    assert large is small
+
+
+def test_pareto_frontier_matches_pairwise_dominance():
+    rng = random.Random(1)
+    results = [{"drivers": rng.randint(10, 20), "buses": rng.randint(4, 10),
+                "service_level": rng.choice([0.8, 0.9, 1.0])} for _ in range(60)]
+    frontier = pareto_frontier(results)
+    expected = [result for result in results if not any(dominates(other, result) for other in results)]
+    assert sorted(map(repr, frontier)) == sorted(map(repr, expected))
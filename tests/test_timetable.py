@@ -0,0 +1,51 @@
+"""
+Проверки движка расписания в целых минутах: разбор времени и отправления совпадают
+с пошаговым алгоритмом исходного basic.py.
+"""
+import random
+
+import pytest
+
+from scheduler.cli import DEFAULTS
+from scheduler.timetable import create_bus_schedule, departure_minutes, parse_minutes, service_window
+
+
+def stepwise_departures(start, end, peak_intervals, off_peak_intervals, peak_hours):
+    """Отправления, как их перебирал исходный basic.py: интервал выбирается по часу текущего отправления."""
+    departures = []
+    current = start
+    while current < end:
+        hour = current // 60 % 24
+        departures.append(current)
+        current += peak_intervals if any(first <= hour < last for first, last in peak_hours) else off_peak_intervals
+    return departures
+
+
+@pytest.mark.parametrize("value, minutes", [("00:00", 0), ("07:05", 425), ("7:5", 425), ("23:59", 1439)])
+def test_parse_minutes(value, minutes):
+    assert parse_minutes(value) == minutes
+
+
+@pytest.mark.parametrize("value", ["24:00", "25:99", "99:99", "12:60", "12", "1:2:3", "", "ab:cd", "-1:00"])
+def test_parse_minutes_rejects_malformed_time(value):
+    with pytest.raises(ValueError):
+        parse_minutes(value)
+
+
+def test_create_bus_schedule_rejects_malformed_time():
+    params = {**DEFAULTS, "start_time": "25:99"}
+    with pytest.raises(ValueError):
+        create_bus_schedule(params["start_time"], params["end_time"], params["peak_intervals"],
+                            params["off_peak_intervals"], params["peak_hours"], params["num_buses"],
+                            params["road_time"])
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_departures_match_stepwise_algorithm(seed):
+    rng = random.Random(seed)
+    start, end = service_window(f"{rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}",
+                                f"{rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}")
+    peak_hours = rng.choice([[(7, 9), (17, 19)], [(0, 3), (22, 24)], [(8, 9)], []])
+    intervals = rng.randint(1, 40), rng.randint(1, 90)
+    assert departure_minutes(start, end, *intervals, peak_hours).tolist() == \
+        stepwise_departures(start, end, *intervals, peak_hours)
@@ -0,0 +1,64 @@
+"""
+Проверки валидатора: каждое правило находится на специально построенном нарушении,
+пустое распределение и результат жадного алгоритма проверяются без ошибок.
+"""
+import pytest
+
+from scheduler.cli import DEFAULTS
+from scheduler.drivers import Driver, assign_drivers_to_schedule
+from scheduler.timetable import create_weekly_bus_schedule, from_minutes, weekly_trips
+from scheduler.validate import HARD_RULES, RULES, validate
+
+
+def make_driver(driver_type, routes, driver_id=1):
+    driver = Driver(driver_id, driver_type)
+    for day, start, end in routes:
+        driver.assign_route(day, 0, from_minutes(start), from_minutes(end))
+    return driver
+
+
+def hour(value):
+    return int(value * 60)
+
+
+# Смена типа B на 11 часов без нарушений; тип A - с 7:00 до 15:00 с перерывом
+B_SHIFT = [(hour(6), hour(11)), (hour(11.5), hour(17))]
+A_SHIFT = [(hour(7), hour(10)), (hour(11), hour(15))]
+
+
+@pytest.mark.parametrize("driver_type, routes, rule, count", [
+    ("B", [(0, start, end) for start, end in B_SHIFT] + [(0, hour(16), hour(16.5))], "overlap", 1),
+    # Третий рейс пересекается с первым, хотя начинается после конца второго
+    ("B", [(0, hour(6), hour(12)), (0, hour(7), hour(8)), (0, hour(9), hour(10))] + [(0, hour(12.5), hour(17))],
+     "overlap", 2),
+    ("B", [(0, hour(6), hour(11)), (0, hour(12), hour(19))], "daily_max", 1),
+    ("A", [(0, hour(9), hour(12)), (0, hour(13), hour(17))], "type_a_window", 1),
+    ("A", [(5, start, end) for start, end in A_SHIFT], "type_a_weekend", 1),
+    ("B", [(day, start, end) for day in (0, 1) for start, end in B_SHIFT], "type_b_rest", 1),
+    ("B", [(0, hour(6), hour(10))], "daily_min", 1),
+    ("A", [(0, hour(7), hour(11)), (0, hour(11.5), hour(15))], "break", 1),
+])
+def test_each_rule_is_detected(driver_type, routes, rule, count):
+    counts, reports = validate([make_driver(driver_type, routes)])
+    assert counts == {name: count if name == rule else 0 for name in RULES}
+    assert [entry[0] for entry in reports[(driver_type, 1)]] == [rule] * count
+
+
+def test_valid_shifts_have_no_violations():
+    drivers = [make_driver("A", [(0, start, end) for start, end in A_SHIFT]),
+               make_driver("B", [(day, start, end) for day in (0, 2) for start, end in B_SHIFT], driver_id=2)]
+    counts, reports = validate(drivers)
+    assert sum(counts.values()) == 0
+    assert reports == {}
+
+
+def test_empty_assignment():
+    counts, reports = validate([Driver(1, "A")])
+    assert sum(counts.values()) == 0
+    assert validate([]) == (counts, reports)
+
+
+def test_greedy_assignment_breaks_no_hard_rules():
+    drivers = assign_drivers_to_schedule(weekly_trips(create_weekly_bus_schedule(**DEFAULTS), DEFAULTS["road_time"]))
+    counts, _ = validate(drivers)
+    assert all(counts[rule] == 0 for rule in HARD_RULES)